@@ -40,6 +40,14 @@ import logging
 logging.getLogger('aiohttp').setLevel(logging.ERROR)
 logging.getLogger('asyncio').setLevel(logging.ERROR)
 
+# Быстрый event loop (uvloop) там, где он доступен (Linux/macOS).
+# На Windows uvloop не поддерживается - остается стандартный asyncio loop
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
 # ============================================================
 # КРИТИЧНО: Установка SDK патчей ДО всех импортов SDK
 # ============================================================
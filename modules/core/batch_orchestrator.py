@@ -33,7 +33,7 @@ Batch Orchestrator - центральная система управления
 import asyncio
 import time
 import random
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
 from dataclasses import dataclass, field
 from modules.core.logger import setup_logger
 from modules.core.account_pool import AccountPool, BalancedAccountPool
@@ -296,16 +296,17 @@ class TradingWorker:
         pnl = 0.0
 
         # Получить объекты AccountConfig из account_ids
+        # Индекс строим один раз: ключи - разные поля (account_id, name, id) и имя,
+        # при совпадении ключей побеждает первый аккаунт (как при линейном поиске)
+        accounts_by_id: Dict[str, Any] = {}
+        for acc in self.trader.accounts:
+            acc_identifier = str(getattr(acc, 'account_id', None) or getattr(acc, 'name', None) or getattr(acc, 'id', None))
+            accounts_by_id.setdefault(acc_identifier, acc)
+            accounts_by_id.setdefault(acc.name, acc)
+
         accounts = []
         for acc_id in task.account_ids:
-            # Найти аккаунт в списке всех аккаунтов трейдера
-            found = None
-            for acc in self.trader.accounts:
-                # Проверяем разные поля: account_id, name, id
-                acc_identifier = str(getattr(acc, 'account_id', None) or getattr(acc, 'name', None) or getattr(acc, 'id', None))
-                if acc_identifier == acc_id or acc.name == acc_id:
-                    found = acc
-                    break
+            found = accounts_by_id.get(acc_id)
 
             if found:
                 accounts.append(found)
@@ -14,31 +14,65 @@ Batch Trader - Торговля пачками аккаунтов по логи
 """
 
 import asyncio
+import functools
+import logging
 import random
 import time
 import traceback
-from decimal import Decimal
-from typing import List, Dict, Optional
+from decimal import Context, Decimal, ROUND_DOWN
+from typing import List, Dict, NamedTuple, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
+import aiohttp
+
 from modules.core.extended_client import ExtendedClient, AccountConfig
 from modules.helpers.market_data import MarketDataProvider
 from modules.core.logger import setup_logger
 from modules.helpers.orderbook_cache import orderbook_cache
+from modules.helpers.position_cache import position_cache
+from modules.helpers.rate_limiter import AsyncRateLimiter
+from modules.helpers.circuit_breaker import CircuitBreaker
 from modules.helpers.websocket_manager import ExtendedWebSocketManager
 from modules.helpers.market_rules import market_rules
-from modules.core.constants import RETRY_SETTINGS, LIMIT_ORDER_CONFIG, WEBSOCKET_CONFIG
+from modules.core.constants import (
+    RETRY_SETTINGS, LIMIT_ORDER_CONFIG, WEBSOCKET_CONFIG, RATE_LIMIT_CONFIG, HTTP_POOL_CONFIG,
+    MONITOR_LOG_CONFIG
+)
 from settings import TRADING_SETTINGS, POSITION_MANAGEMENT, DELAYS
 
 from x10.perpetual.orders import OrderTpslType, OrderTriggerPriceType, OrderPriceType
 from x10.perpetual.order_object import OrderTpslTriggerParam
 
 
+def _as_decimal(value) -> Decimal:
+    """Привести значение к Decimal (Decimal из SDK возвращается как есть, без str())"""
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+def _to_float(value) -> float:
+    """Значение от биржи (Decimal, строка, число) во float; 0.0 если не распознано"""
+    try:
+        return float(value) if value else 0.0
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def _abs_position_size(position: Dict) -> float:
+    """Модуль размера позиции во float (0.0 если размер не распознан)"""
+    size = position.get('size')
+    try:
+        return abs(float(size)) if size else 0.0
+    except (ValueError, TypeError):
+        return 0.0
+
+
 def round_to_min_size(amount: Decimal, market: str) -> Decimal:
     """
     Округлить размер позиции до минимального изменения размера для рынка
-    Использует правила из market_rules_config.py
+    Использует правила из market_rules_config.py (шаг кешируется в market_rules)
 
     Args:
         amount: Размер позиции
@@ -47,7 +81,6 @@ def round_to_min_size(amount: Decimal, market: str) -> Decimal:
     Returns:
         Округленный размер
     """
-    # Используем market_rules для получения корректного min_change_size
     # Убираем суффикс -USD если есть
     clean_market = market.replace('-USD', '')
 
@@ -62,6 +95,96 @@ def round_to_min_size(amount: Decimal, market: str) -> Decimal:
     return rounded
 
 
+# Константы горячего пути закрытия (settings.py читается один раз при запуске)
+_DEC_ZERO = Decimal(0)
+_DEC_ONE = Decimal(1)
+_DEC_THREE_HUNDRED = Decimal(300)
+_DEC_HUNDRED = Decimal(100)
+# Slippage exec price стоплосса от trigger price (3%)
+_SL_SLIPPAGE = Decimal('0.03')
+# Размер, ниже которого позиция считается отсутствующей (пыль после закрытия).
+# Сравнение идет во float: Decimal нужен только для размеров, уходящих в ордер
+_MIN_POSITION_SIZE = 1e-4
+# Контекст для ценовой арифметики: 12 значащих цифр достаточно (цена все равно
+# округляется вниз до min_price_change), а короткие операнды считаются быстрее
+_PRICE_CTX = Context(prec=12, rounding=ROUND_DOWN)
+_OFFSET = Decimal(str(TRADING_SETTINGS['limit_order_offset_percent']))
+_USE_ADAPTIVE = TRADING_SETTINGS['use_adaptive_offset']
+_CLOSE_TIMEOUT = TRADING_SETTINGS['position_close_timeout']
+_MULT_UP = _DEC_ONE + _OFFSET
+_MULT_DOWN = _DEC_ONE - _OFFSET
+
+# Сторона закрывающего ордера и база цены (ask для LONG, bid для SHORT) по стороне позиции
+_CLOSE_SIDE = {"LONG": "SELL", "SHORT": "BUY"}
+_PRICE_SELECT_IS_ASK = {"LONG": True, "SHORT": False}
+
+# Ключи, под которыми SDK/REST возвращают ID ордера (в порядке приоритета)
+_ORDER_ID_KEYS = ('id', 'order_id', 'orderId')
+
+
+def _extract_order_id(order: Optional[Dict]) -> str:
+    """Достать ID ордера из ответа биржи ('unknown' если ID нет)"""
+    if not order:
+        return 'unknown'
+    return next((order[key] for key in _ORDER_ID_KEYS if order.get(key)), 'unknown')
+
+
+# Паузы опроса позиции после маркет-закрытия (сек): маркет исполняется за десятки мс
+_MARKET_CLOSE_POLL_DELAYS = (0.1, 0.2, 0.4, 0.8, 1.5)
+_MARKET_CLOSE_CONFIRM_TIMEOUT = sum(_MARKET_CLOSE_POLL_DELAYS)
+# Нижняя граница интервала опроса позиций: слишком частый опрос параллельных
+# ожидающих только грузит CPU и биржу
+_MIN_POLL_INTERVAL = 0.05
+
+# Рамка сводки размеров позиций в логе
+_BOX_WIDTH = 50
+_BOX_BORDER = "+" + "-" * _BOX_WIDTH + "+"
+
+# Шаг квантования оффсета для кэша множителей цены (1e-8)
+OFFSET_QUANT = Decimal('0.00000001')
+
+
+@functools.lru_cache(maxsize=1024)
+def _offset_factors(offset_q8: int) -> Tuple[Decimal, Decimal]:
+    """
+    Множители цены для закрывающего лимитного ордера
+
+    Args:
+        offset_q8: Оффсет, квантованный до 1e-8 (целое число шагов OFFSET_QUANT)
+
+    Returns:
+        (up, down) = (1 + offset, 1 - offset): цена SELL = ask * up, цена BUY = bid * down
+    """
+    offset = offset_q8 * OFFSET_QUANT
+    return _DEC_ONE + offset, _DEC_ONE - offset
+
+
+def get_offset_factors(offset: Decimal) -> Tuple[Decimal, Decimal]:
+    """Получить (up, down) множители для оффсета через кэш _offset_factors"""
+    return _offset_factors(int(offset / OFFSET_QUANT))
+
+
+_BACKOFF_BASE = RETRY_SETTINGS['base_delay']
+_BACKOFF_CAP = RETRY_SETTINGS['max_delay']
+_BACKOFF_JITTER = RETRY_SETTINGS['jitter']
+
+
+def _backoff_delay(attempt: int) -> float:
+    """
+    Пауза перед повторной попыткой: экспоненциальный рост с jitter
+
+    Первая повторная попытка идет быстро (кратковременный сбой), следующие
+    ждут дольше, чтобы не добивать биржу запросами под rate limit.
+
+    Args:
+        attempt: Номер неудавшейся попытки (с 0)
+
+    Returns:
+        Задержка в секундах (не больше RETRY_SETTINGS['max_delay'])
+    """
+    return min(_BACKOFF_CAP, _BACKOFF_BASE * (2 ** attempt) * (1 + random.uniform(0, _BACKOFF_JITTER)))
+
+
 def distribute_amount_randomly(total: Decimal, num_parts: int, variation_range: tuple) -> List[Decimal]:
     """
     Распределить сумму между частями с рандомизацией размеров.
@@ -84,29 +207,47 @@ def distribute_amount_randomly(total: Decimal, num_parts: int, variation_range:
         return [total]
 
     # Генерируем случайные веса с вариацией
-    # Базовый вес = 1.0, добавляем случайное отклонение
+    # Базовый вес = 1.0, случайное отклонение от -max_var до +max_var,
+    # минимум 0.3 гарантирует положительный вес
     min_var, max_var = variation_range
-    weights = []
+    uniform = random.uniform
+    weights = [max(0.3, 1.0 + uniform(-max_var, max_var)) for _ in range(num_parts)]
 
-    for _ in range(num_parts):
-        # Случайная вариация: от -max_var до +max_var
-        variation = random.uniform(-max_var, max_var)
-        weight = 1.0 + variation
-        # Гарантируем положительный вес (минимум 0.3)
-        weight = max(0.3, weight)
-        weights.append(weight)
-
-    # Нормализуем веса чтобы сумма = 1
+    # Нормализуем веса и распределяем сумму; последний элемент не считаем -
+    # он корректируется до точной суммы (из-за округлений)
     total_weight = sum(weights)
-    normalized_weights = [w / total_weight for w in weights]
+    amounts = [total * Decimal(str(w / total_weight)) for w in weights[:-1]]
+    amounts.append(total - sum(amounts))
 
-    # Распределяем сумму согласно весам
-    amounts = [total * Decimal(str(w)) for w in normalized_weights]
+    return amounts
 
-    # Корректируем последний элемент для точной суммы (из-за округлений)
-    amounts[-1] = total - sum(amounts[:-1])
 
-    return amounts
+def _monitor_pnl(side_sign: int, size, entry, mark) -> Optional[Tuple[float, float, float, float]]:
+    """
+    PnL позиции по текущей цене для мониторинга (float - нужен только для отображения)
+
+    Args:
+        side_sign: +1 для LONG, -1 для SHORT
+        size: Размер позиции
+        entry: Цена входа
+        mark: Текущая цена (mid из стакана)
+
+    Returns:
+        (mark, notional, pnl_value, pnl_pct) или None, если данных не хватает
+    """
+    try:
+        size_f = abs(float(size))
+        entry_f = float(entry)
+        mark_f = float(mark)
+    except (ValueError, TypeError):
+        return None
+
+    if size_f == 0.0 or entry_f == 0.0 or mark_f <= 0.0:
+        return None
+
+    diff = side_sign * (mark_f - entry_f)
+    # PnL% относительно стоимости позиции по текущей цене (как _calculate_pnl_percent)
+    return mark_f, size_f * mark_f, diff * size_f, diff / mark_f * 100.0
 
 
 @dataclass
@@ -131,6 +272,64 @@ class AccountBatch:
         return len(self.short_accounts)
 
 
+@dataclass
+class PositionState:
+    """
+    Состояние позиции аккаунта в мониторинге (один объект на аккаунт, обновляется каждый тик)
+
+    Все числовые поля - float (значения биржи приводятся при записи): они нужны
+    только для отображения и стоплосса по PnL%.
+    """
+    account: str
+    side: str = 'UNKNOWN'
+    side_sign: int = 1  # +1 LONG / -1 SHORT, известен с момента формирования пачки
+    size: float = 0.0
+    entry: float = 0.0
+    mark: float = 0.0
+    notional: float = 0.0
+    pnl_pct: float = 0.0
+    pnl_value: float = 0.0
+    logged_pnl_pct: Optional[float] = None  # PnL% на момент последней выведенной сводки
+
+
+class _CloseTask(NamedTuple):
+    """Позиция к закрытию в _close_positions_batch (доступ к полям по атрибутам, без словаря)"""
+    key: Tuple[str, str]
+    account_name: str
+    account: AccountConfig
+    client: ExtendedClient
+    market: str
+    position: Dict
+    close_side: str
+    size: Decimal
+    pos_side: str
+
+
+class CloseStatus:
+    """Статус закрытия позиций пачки (ключ (аккаунт, рынок)) со счетчиком успехов"""
+
+    def __init__(self, keys: List[Tuple[str, str]]):
+        self._closed: Dict[Tuple[str, str], bool] = {key: False for key in keys}
+        self.success = 0
+
+    @property
+    def total(self) -> int:
+        return len(self._closed)
+
+    @property
+    def all_closed(self) -> bool:
+        return self.success == self.total
+
+    def is_closed(self, key: Tuple[str, str]) -> bool:
+        return self._closed[key]
+
+    def mark_success(self, key: Tuple[str, str]) -> None:
+        """Отметить позицию закрытой (счетчик растет только при первом переходе)"""
+        if not self._closed[key]:
+            self._closed[key] = True
+            self.success += 1
+
+
 class BatchTrader:
     """
     Торговля пачками аккаунтов
@@ -157,9 +356,32 @@ class BatchTrader:
             testnet: Использовать тестнет
             logger: Логгер
         """
+        # Сеттер accounts заодно строит индекс _accounts_by_name
         self.accounts = accounts
         self.testnet = testnet
         self.logger = logger or setup_logger()
+        # Включены ли DEBUG/INFO хотя бы в одном обработчике (для горячих путей)
+        self._debug = self.logger.isEnabledFor(logging.DEBUG)
+        self._info = self.logger.isEnabledFor(logging.INFO)
+
+        # Снимок настроек (settings.py читается один раз при запуске)
+        self._leverage_map: Dict = dict(TRADING_SETTINGS['leverage'])
+        self._default_leverage = self._leverage_map.get('BTC', 10)
+        self._order_type: str = TRADING_SETTINGS.get('order_type', 'LIMIT')
+        # Закрытие одиночной позиции: способ фиксирован на все время работы
+        if self._order_type == "MARKET":
+            self._close_impl = self._close_position_with_market
+            self._close_failure_message = "Failed to close position with market order"
+        else:
+            self._close_impl = self._close_position_with_limit_retry
+            self._close_failure_message = "Failed to close position with limit orders"
+        self._between_orders: Tuple[float, float] = tuple(DELAYS['between_orders'])
+        self._on_error_delay = DELAYS.get('on_error', 60)
+        self._sl_enabled = POSITION_MANAGEMENT.get('stop_loss_enabled', False)
+        self._sl_percent = Decimal(str(POSITION_MANAGEMENT.get('stop_loss_percent', -70)))
+        # market -> множители цен SL (см. _get_sl_factors)
+        self._sl_factors: Dict[str, Tuple[Decimal, Tuple[Decimal, Decimal], Tuple[Decimal, Decimal]]] = {}
+        self._monitor_interval = POSITION_MANAGEMENT['monitor_interval_sec']
 
         # Создаем клиентов для каждого аккаунта
         self.clients: Dict[str, ExtendedClient] = {}
@@ -170,6 +392,29 @@ class BatchTrader:
                 logger=self.logger
             )
 
+        # Ограничение всплесков запросов пачки (leverage, открытие позиций)
+        self._rate_limiter = AsyncRateLimiter(
+            max_rate=RATE_LIMIT_CONFIG['requests_per_second'],
+            time_period=1.0
+        )
+
+        # Circuit breaker опроса позиций по аккаунтам (создаются по требованию)
+        self._position_breakers: Dict[str, CircuitBreaker] = {}
+
+        # Короткий кеш REST цен по рынку: market -> (monotonic время, bid, ask),
+        # и текущие REST запросы цен, чтобы параллельные закрытия делили один запрос
+        self._rest_price_memo: Dict[str, Tuple[float, Decimal, Decimal]] = {}
+        self._rest_price_inflight: Dict[str, asyncio.Task] = {}
+        # Рынки, по которым WebSocket стакан сейчас устарел (для логирования переходов)
+        self._stale_markets = set()
+
+        # Все позиции аккаунта в раунде закрытия: account_name -> (monotonic время, задача запроса);
+        # один запрос на аккаунт вместо запроса на каждую пару (аккаунт, рынок)
+        self._round_positions: Dict[str, Tuple[float, asyncio.Task]] = {}
+
+        # Общий пул соединений для аккаунтов без прокси (создается в initialize())
+        self._shared_connector: Optional[aiohttp.TCPConnector] = None
+
         # Провайдер маркет-данных
         self.market_data = MarketDataProvider(testnet=testnet, logger=self.logger)
 
@@ -183,6 +428,12 @@ class BatchTrader:
                 testnet=testnet
             )
 
+        # Позиции читаются из кеша приватного потока аккаунтов (REST - снапшот и сверка)
+        self._use_position_stream = (
+            self.ws_manager is not None
+            and WEBSOCKET_CONFIG.get('positions_stream_enabled', False)
+        )
+
         # Активные пачки
         self.active_batches: List[AccountBatch] = []
 
@@ -196,6 +447,17 @@ class BatchTrader:
 
         # BatchTrader инициализирован (техническая информация)
 
+    @property
+    def accounts(self) -> List[AccountConfig]:
+        """Аккаунты трейдера"""
+        return self._accounts
+
+    @accounts.setter
+    def accounts(self, accounts: List[AccountConfig]):
+        """Заменить список аккаунтов и пересобрать индекс по имени"""
+        self._accounts = accounts
+        self._accounts_by_name: Dict[str, AccountConfig] = {a.name: a for a in accounts}
+
     async def initialize(self):
         """Инициализировать всех клиентов и WebSocket
         
@@ -204,10 +466,23 @@ class BatchTrader:
         - Если часть аккаунтов не инициализировалась - продолжаем с оставшимися
         - Критическая ошибка только если НИ ОДИН аккаунт не инициализирован
         """
+        # Аккаунты без прокси и провайдер маркет-данных ходят на биржу
+        # через один общий пул соединений
+        if self._shared_connector is None:
+            self._shared_connector = aiohttp.TCPConnector(
+                limit=HTTP_POOL_CONFIG['limit'],
+                limit_per_host=HTTP_POOL_CONFIG['limit_per_host'],
+                keepalive_timeout=HTTP_POOL_CONFIG['keepalive_timeout'],
+                ttl_dns_cache=300
+            )
+            self.market_data.shared_connector = self._shared_connector
+
         # Инициализируем клиентов параллельно
         tasks = {}
         for name, client in self.clients.items():
-            tasks[name] = asyncio.create_task(client.initialize())
+            tasks[name] = asyncio.create_task(
+                client.initialize(shared_connector=self._shared_connector)
+            )
 
         # Ждем завершения ВСЕХ задач (return_exceptions=True не бросает исключение)
         results = await asyncio.gather(*tasks.values(), return_exceptions=True)
@@ -250,6 +525,10 @@ class BatchTrader:
 
         # Запускаем WebSocket Manager для лимитных ордеров (в фоне, без логирования)
         if self.ws_manager:
+            # Приватные потоки позиций - мониторинг читает позиции из кеша вместо REST
+            if self._use_position_stream:
+                for account in self.accounts:
+                    self.ws_manager.add_account_stream(account.name, account.api_key, account.proxy)
             asyncio.create_task(self.ws_manager.start())
             await asyncio.sleep(3)
 
@@ -274,25 +553,26 @@ class BatchTrader:
             return []
 
         batches = []
-        remaining = accounts.copy()
+        total = len(accounts)
+        cursor = 0  # Индекс первого аккаунта, еще не попавшего в пачку
 
-        # Случайный выбор рынка для каждой пачки
-        markets = TRADING_SETTINGS['markets']
+        # Настройки читаются один раз до цикла
+        markets = TRADING_SETTINGS['markets']  # Случайный выбор рынка для каждой пачки
+        min_size, max_size = TRADING_SETTINGS['batch_size_range']
+        min_longs, max_longs = TRADING_SETTINGS['long_accounts_range']
 
-        while remaining:
+        while cursor < total:
             # Случайный размер пачки
-            min_size, max_size = TRADING_SETTINGS['batch_size_range']
             batch_size = random.randint(
                 min_size,
-                min(max_size, len(remaining))
+                min(max_size, total - cursor)
             )
 
-            # Берем аккаунты для пачки
-            batch_accounts = remaining[:batch_size]
-            remaining = remaining[batch_size:]
+            # Берем аккаунты для пачки (срез - единственная копия)
+            batch_accounts = accounts[cursor:cursor + batch_size]
+            cursor += batch_size
 
             # Случайное количество лонгов
-            min_longs, max_longs = TRADING_SETTINGS['long_accounts_range']
             long_count = random.randint(
                 min_longs,
                 min(max_longs, batch_size - 1)  # Должен быть хотя бы 1 шорт
@@ -341,10 +621,7 @@ class BatchTrader:
 
         try:
             # Получаем leverage для рынка (поддержка [min, max, step] и фиксированного значения)
-            leverage_config = TRADING_SETTINGS['leverage'].get(
-                batch.market,
-                TRADING_SETTINGS['leverage'].get('BTC', 10)
-            )
+            leverage_config = self._leverage_map.get(batch.market, self._default_leverage)
 
             # Устанавливаем leverage для всех аккаунтов (с рандомизацией если задан диапазон)
             await self._set_leverage_for_batch(batch, leverage_config)
@@ -382,6 +659,11 @@ class BatchTrader:
         else:
             return int(leverage_config) if leverage_config else 10
 
+    async def _rate_limited(self, coro):
+        """Выполнить корутину после получения токена из общего лимитера запросов"""
+        async with self._rate_limiter:
+            return await coro
+
     async def _set_leverage_for_batch(self, batch: AccountBatch, leverage_config):
         """
         Установить leverage для всех аккаунтов пачки.
@@ -405,7 +687,7 @@ class BatchTrader:
             account_leverage = self._resolve_leverage(leverage_config)
             leverages[account.name] = account_leverage
             self.logger.info(f"{account.name}: leverage = {account_leverage}x")
-            tasks.append(client.update_leverage(market_name, account_leverage))
+            tasks.append(self._rate_limited(client.update_leverage(market_name, account_leverage)))
 
         try:
             results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -435,7 +717,7 @@ class BatchTrader:
     async def _open_positions(self, batch: AccountBatch):
         """Открыть позиции для пачки"""
         market_name = f"{batch.market}-USD"
-        order_type = TRADING_SETTINGS.get('order_type', 'LIMIT')
+        order_type = self._order_type
 
         self.logger.info(
             f"\n{'='*60}\n"
@@ -462,32 +744,37 @@ class BatchTrader:
         long_sizes = distribute_amount_randomly(long_total_usd, len(batch.long_accounts), variation_range)
         short_sizes = distribute_amount_randomly(short_total_usd, len(batch.short_accounts), variation_range)
 
-        self.logger.info("")
-        box_width = 50
-        self.logger.info("+" + "-" * box_width + "+")
-        self.logger.info(f"|  РАЗМЕР ПОЗИЦИЙ{' ' * (box_width - 17)}|")
-        self.logger.info("+" + "-" * box_width + "+")
-        line1 = f"Общий размер пачки:   $ {total_batch_size_usd:>10.2f}"
-        line2 = f"|- Лонги (всего):     $ {long_total_usd:>10.2f}"
-        line3 = f"'- Шорты (всего):     $ {short_total_usd:>10.2f}"
-        self.logger.info(f"| {line1:<{box_width - 2}}|")
-        self.logger.info(f"| {line2:<{box_width - 2}}|")
-        self.logger.info(f"| {line3:<{box_width - 2}}|")
-        self.logger.info("+" + "-" * box_width + "+")
-        # Показываем индивидуальные размеры для каждого аккаунта
-        long_sizes_str = ", ".join([f"${s:.2f}" for s in long_sizes])
-        short_sizes_str = ", ".join([f"${s:.2f}" for s in short_sizes])
-        line4 = f"Лонги ({len(long_sizes)}): {long_sizes_str}"
-        line5 = f"Шорты ({len(short_sizes)}): {short_sizes_str}"
-        self.logger.info(f"| {line4:<{box_width - 2}}|")
-        self.logger.info(f"| {line5:<{box_width - 2}}|")
-        self.logger.info("+" + "-" * box_width + "+")
-        self.logger.info("")
-        self.logger.debug(
-            f"Детали: long_accounts={len(batch.long_accounts)}, "
-            f"short_accounts={len(batch.short_accounts)}, "
-            f"long_sizes={[float(s) for s in long_sizes]}, short_sizes={[float(s) for s in short_sizes]}"
-        )
+        # Рамка собирается в одно сообщение: один проход через обработчики логгера
+        if self._info:
+            inner = _BOX_WIDTH - 2
+            line1 = f"Общий размер пачки:   $ {total_batch_size_usd:>10.2f}"
+            line2 = f"|- Лонги (всего):     $ {long_total_usd:>10.2f}"
+            line3 = f"'- Шорты (всего):     $ {short_total_usd:>10.2f}"
+            # Показываем индивидуальные размеры для каждого аккаунта
+            long_sizes_str = ", ".join([f"${s:.2f}" for s in long_sizes])
+            short_sizes_str = ", ".join([f"${s:.2f}" for s in short_sizes])
+            line4 = f"Лонги ({len(long_sizes)}): {long_sizes_str}"
+            line5 = f"Шорты ({len(short_sizes)}): {short_sizes_str}"
+            self.logger.info("\n".join((
+                "",
+                _BOX_BORDER,
+                f"|  РАЗМЕР ПОЗИЦИЙ{' ' * (_BOX_WIDTH - 17)}|",
+                _BOX_BORDER,
+                f"| {line1:<{inner}}|",
+                f"| {line2:<{inner}}|",
+                f"| {line3:<{inner}}|",
+                _BOX_BORDER,
+                f"| {line4:<{inner}}|",
+                f"| {line5:<{inner}}|",
+                _BOX_BORDER,
+                "",
+            )))
+        if self._debug:
+            self.logger.debug(
+                f"Детали: long_accounts={len(batch.long_accounts)}, "
+                f"short_accounts={len(batch.short_accounts)}, "
+                f"long_sizes={[float(s) for s in long_sizes]}, short_sizes={[float(s) for s in short_sizes]}"
+            )
 
         # Формируем список всех аккаунтов с параметрами
         accounts_to_open = []
@@ -513,14 +800,18 @@ class BatchTrader:
             })
 
         # Запускаем открытие позиций ПАРАЛЛЕЛЬНО с задержкой between_orders
+        # (between_orders = [0, 0] - все ордера отправляются одновременно)
+        between_orders = self._between_orders
+        stagger_orders = between_orders[1] > 0
         tasks = []
 
         for idx, params in enumerate(accounts_to_open):
             # Логируем параметры запуска для отладки параллельности
             client = self.clients[params['account'].name]
-            self.logger.debug(
-                f"Запуск задачи открытия: idx={idx}, account={params['account'].name}, side={params['side']}, size_usd={params['size_usd']}, proxy={client.proxy}"
-            )
+            if self._debug:
+                self.logger.debug(
+                    f"Запуск задачи открытия: idx={idx}, account={params['account'].name}, side={params['side']}, size_usd={params['size_usd']}, proxy={client.proxy}"
+                )
             # Создаём task для открытия позиции
             task = asyncio.create_task(
                 self._open_position(
@@ -534,9 +825,10 @@ class BatchTrader:
             tasks.append(task)
 
             # Задержка между запуском ордеров (не ждём исполнения)
-            if idx < len(accounts_to_open) - 1:
-                delay = random.uniform(*DELAYS['between_orders'])
-                self.logger.debug(f"Задержка перед следующим ордером: {delay:.1f}s")
+            if stagger_orders and idx < len(accounts_to_open) - 1:
+                delay = random.uniform(*between_orders)
+                if self._debug:
+                    self.logger.debug(f"Задержка перед следующим ордером: {delay:.1f}s")
                 await asyncio.sleep(delay)
 
         # Теперь ждём завершения всех tasks
@@ -585,16 +877,9 @@ class BatchTrader:
         Returns:
             (OrderTpslTriggerParam, OrderTpslType) или (None, None) если SL отключён
         """
-        sl_enabled = POSITION_MANAGEMENT.get('stop_loss_enabled', False)
-        if not sl_enabled:
+        if not self._sl_enabled:
             return None, None
 
-        sl_percent = Decimal(str(POSITION_MANAGEMENT.get('stop_loss_percent', -70)))
-        abs_sl = abs(sl_percent)
-
-        # Slippage для LIMIT exec price (от trigger price)
-        slippage = Decimal('0.03')  # 3% slippage
-
         # Для ORDER TPSL:
         # trigger_price и exec_price задаются как АБСОЛЮТНЫЕ цены
         # НО SDK рассчитывает settlement на основе exec_price
@@ -608,38 +893,29 @@ class BatchTrader:
         # Конкретные trigger/exec prices будут заданы в caller'ах
         return None, OrderTpslType.ORDER
 
-    def _calculate_sl_trigger_param(
+    def _get_sl_factors(
         self,
-        side: str,
-        order_price: Decimal,
-        market: str,
-    ) -> Optional[OrderTpslTriggerParam]:
+        market: str
+    ) -> Tuple[Decimal, Tuple[Decimal, Decimal], Tuple[Decimal, Decimal]]:
         """
-        Рассчитать конкретные параметры SL для данной цены ордера.
+        Множители цен SL для рынка (кешируются: плечо и процент SL не меняются)
+
+        trigger = entry * (1 ∓ |sl_percent| / (leverage * 100)), exec = trigger * (1 ∓ slippage)
 
         Args:
-            side: Сторона ордера (BUY/SELL)
-            order_price: Цена ордера (лимитная или маркетная)
-            market: Рынок для округления цены
+            market: Рынок
 
         Returns:
-            OrderTpslTriggerParam или None если SL отключён
+            (leverage, (trigger, exec) для LONG, (trigger, exec) для SHORT)
         """
-        sl_enabled = POSITION_MANAGEMENT.get('stop_loss_enabled', False)
-        if not sl_enabled:
-            return None
-
-        sl_percent = Decimal(str(POSITION_MANAGEMENT.get('stop_loss_percent', -70)))
-        abs_sl = abs(sl_percent)
-        slippage = Decimal('0.03')  # 3% slippage для exec price
+        cached = self._sl_factors.get(market)
+        if cached is not None:
+            return cached
 
         # Получаем leverage для расчёта trigger price
         # Берём из TRADING_SETTINGS (может быть range — берём среднее)
         market_short = market.replace('-USD', '')
-        leverage_config = TRADING_SETTINGS['leverage'].get(
-            market_short,
-            TRADING_SETTINGS['leverage'].get('BTC', 10)
-        )
+        leverage_config = self._leverage_map.get(market_short, self._default_leverage)
         if isinstance(leverage_config, (list, tuple)):
             leverage = Decimal(str((leverage_config[0] + leverage_config[1]) // 2))
         else:
@@ -648,26 +924,51 @@ class BatchTrader:
         if leverage <= 0:
             leverage = Decimal('10')
 
-        if side == "BUY":
-            # LONG: SL ниже entry
-            trigger_price = order_price * (Decimal('1') - abs_sl / (leverage * Decimal('100')))
-            # Exec price ещё ниже trigger (slippage для гарантии исполнения)
-            exec_price = trigger_price * (Decimal('1') - slippage)
-        else:
-            # SHORT: SL выше entry
-            trigger_price = order_price * (Decimal('1') + abs_sl / (leverage * Decimal('100')))
-            # Exec price ещё выше trigger
-            exec_price = trigger_price * (Decimal('1') + slippage)
+        move = abs(self._sl_percent) / (leverage * _DEC_HUNDRED)
+        cached = self._sl_factors[market] = (
+            leverage,
+            (_DEC_ONE - move, _DEC_ONE - _SL_SLIPPAGE),
+            (_DEC_ONE + move, _DEC_ONE + _SL_SLIPPAGE),
+        )
+        return cached
+
+    def _calculate_sl_trigger_param(
+        self,
+        side: str,
+        order_price: Decimal,
+        market: str,
+    ) -> Optional[OrderTpslTriggerParam]:
+        """
+        Рассчитать конкретные параметры SL для данной цены ордера.
+
+        Args:
+            side: Сторона ордера (BUY/SELL)
+            order_price: Цена ордера (лимитная или маркетная)
+            market: Рынок для округления цены
+
+        Returns:
+            OrderTpslTriggerParam или None если SL отключён
+        """
+        if not self._sl_enabled:
+            return None
+
+        leverage, long_factors, short_factors = self._get_sl_factors(market)
+        # LONG: SL ниже entry, exec еще ниже trigger (slippage для гарантии исполнения);
+        # SHORT: зеркально выше
+        trigger_factor, exec_factor = long_factors if side == "BUY" else short_factors
+        trigger_price = order_price * trigger_factor
+        exec_price = trigger_price * exec_factor
 
         # Округляем до min_price_change
         trigger_price = market_rules.round_price_to_min_change(market, trigger_price)
         exec_price = market_rules.round_price_to_min_change(market, exec_price)
 
-        self.logger.debug(
-            f"SL params: side={side}, order_price={order_price}, "
-            f"leverage={leverage}x, sl%={sl_percent}, "
-            f"trigger={trigger_price}, exec={exec_price}"
-        )
+        if self._debug:
+            self.logger.debug(
+                f"SL params: side={side}, order_price={order_price}, "
+                f"leverage={leverage}x, sl%={self._sl_percent}, "
+                f"trigger={trigger_price}, exec={exec_price}"
+            )
 
         # TradFi активы (group 5: XAU, XAG, EUR и др.) требуют MARK trigger price
         # API возвращает ошибку 1149 "Non-mark trigger price on TradFi asset is not allowed"
@@ -764,13 +1065,10 @@ class BatchTrader:
                 )
             else:  # LIMIT
                 # Для лимитного ордера используем текущую цену с небольшим offset
-                offset_pct = Decimal(str(
-                    TRADING_SETTINGS['limit_order_offset_percent']
-                ))
                 if side == "BUY":
-                    limit_price = current_price * (Decimal('1') - offset_pct)
+                    limit_price = current_price * _MULT_DOWN
                 else:
-                    limit_price = current_price * (Decimal('1') + offset_pct)
+                    limit_price = current_price * _MULT_UP
 
                 # Рассчитываем SL trigger price на основе limit price
                 sl_trigger = self._calculate_sl_trigger_param(side, limit_price, market) if sl_type else None
@@ -787,7 +1085,7 @@ class BatchTrader:
                 )
 
             # Получаем ID ордера (только для внутренних целей, не логируем)
-            order_id = order.get('id') or order.get('order_id') or order.get('orderId', 'unknown')
+            order_id = _extract_order_id(order)
 
             # Для IOC маркет-ордеров НЕ проверяем статус через get_order_by_id
             # (API возвращает 404 т.к. ордер уже исполнен/отменен)
@@ -824,9 +1122,10 @@ class BatchTrader:
                         break
                     else:
                         if attempt < 2:
-                            self.logger.debug(
-                                f"{account.name}: позиция еще не появилась, попытка {attempt+1}/3"
-                            )
+                            if self._debug:
+                                self.logger.debug(
+                                    f"{account.name}: позиция еще не появилась, попытка {attempt+1}/3"
+                                )
                         else:
                             self.logger.warning(
                                 f"{account.name}: ордер размещен, но позиция не найдена после 3 попыток!"
@@ -852,7 +1151,7 @@ class BatchTrader:
             self.logger.error(
                 f"{account.name}: ошибка открытия позиции: {type(e).__name__}: {str(e)}"
             )
-            self.logger.error(f"Traceback: {traceback.format_exc()}")
+            # Стек выводит _open_positions, куда ошибка пробрасывается через gather
             self.stats['failed_orders'] += 1
             self.stats['total_orders'] += 1
             raise
@@ -867,16 +1166,28 @@ class BatchTrader:
         """
         market_name = f"{batch.market}-USD"
         all_accounts = batch.long_accounts + batch.short_accounts
+        # Пачки строятся из self.accounts - аккаунты ищем по общему индексу трейдера
+        accounts_by_name = self._accounts_by_name
+        # Сторона каждого аккаунта известна из пачки - в цикле строки не сравниваются
+        position_states = {
+            a.name: PositionState(account=a.name, side='LONG', side_sign=1) for a in batch.long_accounts
+        }
+        position_states.update(
+            (a.name, PositionState(account=a.name, side='SHORT', side_sign=-1)) for a in batch.short_accounts
+        )
+        clients = self.clients
+        market_data = self.market_data
 
         # Настройки стоплосса (ВРЕМЕННО ОТКЛЮЧЕНО)
         sl_enabled = False  # POSITION_MANAGEMENT.get('stop_loss_enabled', False)
         # sl_percent = Decimal(str(POSITION_MANAGEMENT.get('stop_loss_percent', -70)))
 
-        # Время начала и конца удержания
-        start_time = datetime.now()
+        # Время конца удержания: дедлайн по монотонным часам (не зависит от перевода
+        # системного времени), настенное время - только для лога
         min_hold, max_hold = POSITION_MANAGEMENT['holding_time_range']
         hold_duration = random.randint(min_hold, max_hold)
-        end_time = start_time + timedelta(seconds=hold_duration)
+        deadline = time.monotonic() + hold_duration
+        end_time = datetime.now() + timedelta(seconds=hold_duration)
 
         # Компактный заголовок мониторинга
         self.logger.info("")
@@ -887,18 +1198,25 @@ class BatchTrader:
         #     self.logger.info(f"🛡️  Стоплосс: {sl_percent}% PnL (нативный + клиентский фоллбэк)")
         self.logger.info(f"{'─' * 55}")
 
-        monitor_interval = POSITION_MANAGEMENT['monitor_interval_sec']
+        monitor_interval = self._monitor_interval
+
+        # Позиции читаются из кеша приватного потока, REST - только снапшот и сверка
+        use_position_stream = self._use_position_stream
+        reconcile_interval = WEBSOCKET_CONFIG.get('positions_reconcile_interval', 60.0)
+        ws_max_age = LIMIT_ORDER_CONFIG['websocket_cache_max_age']
 
         # Список аккаунтов с открытыми позициями
         open_positions = set(acc.name for acc in all_accounts)
 
         # Счетчик итераций для периодической сводки
         iteration = 0
+        summary_every = max(1, MONITOR_LOG_CONFIG['summary_every_ticks'])
+        summary_pnl_change = float(MONITOR_LOG_CONFIG['summary_pnl_change'])
 
-        while open_positions and datetime.now() < end_time:
+        while open_positions and time.monotonic() < deadline:
             try:
                 # Спим минимум из monitor_interval и оставшегося времени удержания
-                time_left_before_sleep = (end_time - datetime.now()).total_seconds()
+                time_left_before_sleep = deadline - time.monotonic()
                 if time_left_before_sleep <= 0:
                     break
                 sleep_time = min(monitor_interval, time_left_before_sleep)
@@ -906,7 +1224,7 @@ class BatchTrader:
                 iteration += 1
 
                 # Вычисляем оставшееся время
-                time_left = (end_time - datetime.now()).total_seconds()
+                time_left = max(0.0, deadline - time.monotonic())
                 minutes_left = int(time_left // 60)
                 seconds_left = int(time_left % 60)
 
@@ -915,36 +1233,46 @@ class BatchTrader:
                 short_positions_data = []
                 closed_this_iteration = []
 
+                # Позиции из кеша приватного потока (без REST запроса);
+                # аккаунты без актуального кеша опрашиваются REST одним параллельным заходом
+                tick_positions: Dict[str, Optional[List[Dict]]] = {}
+                to_fetch = []
+                for account_name in open_positions:
+                    positions = None
+                    if use_position_stream:
+                        positions = position_cache.get_positions(
+                            account_name, market_name, reconcile_interval
+                        )
+                    tick_positions[account_name] = positions
+                    if positions is None and account_name in accounts_by_name:
+                        to_fetch.append(accounts_by_name[account_name])
+
+                if to_fetch:
+                    # Холодный старт, обрыв потока или плановая сверка - REST снапшот.
+                    # Длительность тика ограничена самым медленным аккаунтом, а не суммой
+                    since = position_cache.marker()
+                    fetched = await self._fetch_monitor_positions(
+                        to_fetch, market_name, timeout=monitor_interval * 0.8
+                    )
+                    for account_name, positions in fetched.items():
+                        tick_positions[account_name] = positions
+                        if use_position_stream:
+                            position_cache.set_snapshot(account_name, market_name, positions, since)
+
                 # Проверяем каждый аккаунт
                 for account_name in list(open_positions):
                     try:
-                        account = next(
-                            (a for a in all_accounts if a.name == account_name),
-                            None
-                        )
+                        account = accounts_by_name.get(account_name)
                         if not account:
                             self.logger.warning(
-                                f"Аккаунт {account_name} не найден в списке all_accounts"
+                                f"Аккаунт {account_name} не найден в списке аккаунтов"
                             )
                             continue
 
-                        # Получаем позиции через REST API для более надежной проверки
-                        self.logger.debug(
-                            f"{account_name}: получение позиций для {market_name} через REST API"
-                        )
-
-                        try:
-                            positions = await self.market_data.get_positions_rest(
-                                api_key=account.api_key,
-                                market=market_name
-                            )
-                        except Exception as e:
-                            # Если REST API не работает, пробуем SDK
-                            self.logger.debug(
-                                f"{account_name}: ошибка REST API ({e}), пробуем SDK"
-                            )
-                            client = self.clients[account_name]
-                            positions = await client.get_positions(market=market_name)
+                        positions = tick_positions.get(account_name)
+                        if positions is None:
+                            # Позицию не удалось получить в этом тике - решение откладываем
+                            continue
 
                         if not positions:
                             # Позиция уже закрыта или не была открыта
@@ -963,36 +1291,31 @@ class BatchTrader:
                             open_positions.discard(account_name)
                             continue
 
-                        # Получаем данные позиции
-                        side = position.get('side', 'UNKNOWN')
-                        size = position.get('size', 0)
-                        unrealized_pnl = position.get('unrealisedPnl', 0)
-                        mark_price = position.get('markPrice', 0)
-                        entry_price = position.get('openPrice', 0)
+                        # Обновляем состояние позиции аккаунта на месте
+                        state = position_states[account_name]
+                        state.size = _to_float(position.get('size'))
+                        state.entry = _to_float(position.get('openPrice'))
 
-                        # Проверяем условия закрытия
-                        pnl_pct = self._calculate_pnl_percent(position)
+                        # Mark цена и PnL считаются локально по mid из стакана WebSocket (float)
+                        mid_price = orderbook_cache.get_mid(market_name, ws_max_age)
+                        marked = None
+                        if mid_price is not None:
+                            marked = _monitor_pnl(state.side_sign, state.size, state.entry, mid_price)
 
-                        # Преобразуем PnL в число для безопасного форматирования
-                        try:
-                            pnl_value = float(unrealized_pnl) if unrealized_pnl else 0.0
-                        except (ValueError, TypeError):
-                            pnl_value = 0.0
+                        if marked is not None:
+                            state.mark, state.notional, state.pnl_value, state.pnl_pct = marked
+                        else:
+                            # Нет свежего стакана - используем поля позиции от биржи
+                            state.mark = _to_float(position.get('markPrice'))
+                            state.notional = _to_float(position.get('value'))
+                            state.pnl_pct = self._calculate_pnl_percent(position)
+                            state.pnl_value = _to_float(position.get('unrealisedPnl'))
 
                         # Собираем данные для группового отображения
-                        pos_data = {
-                            'account': account_name,
-                            'size': size,
-                            'entry': entry_price,
-                            'mark': mark_price,
-                            'pnl_pct': pnl_pct,
-                            'pnl_value': pnl_value
-                        }
-
-                        if side == 'LONG':
-                            long_positions_data.append(pos_data)
+                        if state.side_sign > 0:
+                            long_positions_data.append(state)
                         else:
-                            short_positions_data.append(pos_data)
+                            short_positions_data.append(state)
 
                         # Проверка стоплосса (ВРЕМЕННО ОТКЛЮЧЕНО)
                         # if sl_enabled:
@@ -1020,25 +1343,34 @@ class BatchTrader:
 
                     except Exception as e:
                         self.logger.error(
-                            f"{account_name}: ошибка мониторинга позиции: {e}\n"
-                            f"Traceback:\n{traceback.format_exc()}"
+                            f"{account_name}: ошибка мониторинга позиции: {e}",
+                            exc_info=True
                         )
 
-                # Выводим сгруппированную информацию
-                self._print_positions_summary(
-                    batch.market,
-                    long_positions_data,
-                    short_positions_data,
-                    minutes_left,
-                    seconds_left,
-                    closed_this_iteration,
-                    batch.batch_number
+                # Выводим сгруппированную информацию - одна сводка за тик и только при изменениях:
+                # закрытия, заметное движение PnL или плановый вывод раз в summary_every тиков
+                tick_states = long_positions_data + short_positions_data
+                pnl_moved = any(
+                    st.logged_pnl_pct is None or abs(st.pnl_pct - st.logged_pnl_pct) >= summary_pnl_change
+                    for st in tick_states
                 )
+                if closed_this_iteration or pnl_moved or iteration % summary_every == 0:
+                    for st in tick_states:
+                        st.logged_pnl_pct = st.pnl_pct
+                    self._print_positions_summary(
+                        batch.market,
+                        long_positions_data,
+                        short_positions_data,
+                        minutes_left,
+                        seconds_left,
+                        closed_this_iteration,
+                        batch.batch_number
+                    )
 
             except Exception as e:
                 self.logger.error(
-                    f"Ошибка внешнего цикла мониторинга: {e}\n"
-                    f"Traceback:\n{traceback.format_exc()}"
+                    f"Ошибка внешнего цикла мониторинга: {e}",
+                    exc_info=True
                 )
 
         # Закрываем оставшиеся позиции по истечении времени
@@ -1051,65 +1383,78 @@ class BatchTrader:
             # Собираем информацию о всех позициях для параллельного закрытия
             positions_to_close = []
 
-            for account_name in list(open_positions):
-                account = next(
-                    (a for a in all_accounts if a.name == account_name),
-                    None
-                )
-                if not account:
-                    continue
+            # Свежий снапшот позиций всей пачки одним параллельным заходом
+            # (размер для закрытия берется с биржи, не из кеша)
+            closing_accounts = [
+                accounts_by_name[name] for name in open_positions if name in accounts_by_name
+            ]
+            final_positions = await market_data.get_positions_rest_bulk(
+                api_keys=[account.api_key for account in closing_accounts],
+                market=market_name
+            )
 
+            async def fetch_sdk_position(account: AccountConfig) -> Optional[Dict]:
+                # REST не ответил - всё равно пробуем закрыть через SDK
+                if self._debug:
+                    self.logger.debug(f"{account.name}: не удалось получить позицию через REST")
                 try:
-                    # Получаем позицию для отображения финального PnL
-                    positions = await self.market_data.get_positions_rest(
-                        api_key=account.api_key,
-                        market=market_name
-                    )
-
-                    if positions:
-                        pos = positions[0]
-                        pnl_pct = self._calculate_pnl_percent(pos)
-                        unrealized_pnl = pos.get('unrealisedPnl', 0)
+                    sdk_positions = await clients[account.name].get_positions(market=market_name)
+                    return sdk_positions[0] if sdk_positions else None
+                except Exception as sdk_e:
+                    self.logger.error(f"{account.name}: ошибка получения позиции через SDK: {sdk_e}")
+                    return None
 
-                        # Безопасное преобразование PnL
-                        try:
-                            pnl_value = float(unrealized_pnl) if unrealized_pnl else 0.0
-                        except (ValueError, TypeError):
-                            pnl_value = 0.0
+            # SDK фоллбэк для всех аккаунтов без ответа REST - параллельно
+            sdk_accounts = [a for a in closing_accounts if a.api_key not in final_positions]
+            sdk_positions = {}
+            if sdk_accounts:
+                sdk_results = await asyncio.gather(*(fetch_sdk_position(a) for a in sdk_accounts))
+                sdk_positions = {a.name: pos for a, pos in zip(sdk_accounts, sdk_results)}
 
-                        pnl_icon = "🟢" if pnl_value >= 0 else "🔴"
-                        acc_short = account_name.replace('Account_', '')
-                        self.logger.info(f"  {pnl_icon} {acc_short}: {pnl_pct:+.2f}% (${pnl_value:+.2f})")
+            for account in closing_accounts:
+                account_name = account.name
+                positions = final_positions.get(account.api_key)
 
-                        # Добавляем в список для закрытия
+                if positions is None:
+                    sdk_position = sdk_positions.get(account_name)
+                    if sdk_position:
                         positions_to_close.append({
                             'account_name': account_name,
                             'account': account,
-                            'client': self.clients[account_name],
+                            'client': clients[account_name],
                             'market': market_name,
-                            'position': pos
+                            'position': sdk_position
                         })
-                    else:
+                    continue
+
+                if not positions:
+                    if self._debug:
                         self.logger.debug(f"{account_name}: позиция не найдена (уже закрыта)")
+                    continue
 
-                except Exception as e:
-                    self.logger.debug(
-                        f"{account_name}: не удалось получить позицию: {e}"
-                    )
-                    # Всё равно пробуем закрыть через SDK
-                    try:
-                        client = self.clients[account_name]
-                        sdk_positions = await client.get_positions(market=market_name)
-                        if sdk_positions:
-                            positions_to_close.append({
-                                'account_name': account_name,
-                                'account': account,
-                                'client': client,
-                                'market': market_name,
-                                'position': sdk_positions[0]
-                            })
-                    except Exception as sdk_e:
-                        self.logger.error(f"{account_name}: ошибка получения позиции через SDK: {sdk_e}")
+                # Финальный PnL для отображения
+                pos = positions[0]
+                pnl_pct = self._calculate_pnl_percent(pos)
+                unrealized_pnl = pos.get('unrealisedPnl', 0)
+
+                # Безопасное преобразование PnL
+                try:
+                    pnl_value = float(unrealized_pnl) if unrealized_pnl else 0.0
+                except (ValueError, TypeError):
+                    pnl_value = 0.0
+
+                pnl_icon = "🟢" if pnl_value >= 0 else "🔴"
+                acc_short = account_name.replace('Account_', '')
+                self.logger.info(f"  {pnl_icon} {acc_short}: {pnl_pct:+.2f}% (${pnl_value:+.2f})")
+
+                # Добавляем в список для закрытия
+                positions_to_close.append({
+                    'account_name': account_name,
+                    'account': account,
+                    'client': clients[account_name],
+                    'market': market_name,
+                    'position': pos
+                })
 
             # Параллельное закрытие всех позиций с задержкой между ордерами
             if positions_to_close:
@@ -1128,6 +1473,91 @@ class BatchTrader:
         self.logger.info(f"{'─' * 55}")
         self.logger.info("")
 
+    async def _fetch_monitor_positions(
+        self,
+        accounts: List[AccountConfig],
+        market: str,
+        timeout: float
+    ) -> Dict[str, List[Dict]]:
+        """
+        Получить позиции аккаунтов для тика мониторинга параллельно
+
+        REST запросы всех аккаунтов идут одним заходом, аккаунты с ошибкой REST
+        параллельно опрашиваются через SDK. Весь сбор ограничен timeout.
+        Аккаунты, у которых подряд падают и REST, и SDK, временно не опрашиваются
+        (circuit breaker) - до сверки мониторинг для них опирается на кеш потока.
+
+        Args:
+            accounts: Аккаунты для опроса
+            market: Рынок (с суффиксом -USD)
+            timeout: Максимальное время сбора (сек)
+
+        Returns:
+            Словарь имя аккаунта -> список позиций (аккаунты без ответа отсутствуют)
+        """
+        breakers = []
+        for account in accounts:
+            breaker = self._position_breakers.get(account.name)
+            if breaker is None:
+                breaker = self._position_breakers[account.name] = CircuitBreaker(
+                    fail_max=RATE_LIMIT_CONFIG['positions_breaker_fail_max'],
+                    reset_timeout=RATE_LIMIT_CONFIG['positions_breaker_reset']
+                )
+            breakers.append(breaker)
+        accounts = [account for account, breaker in zip(accounts, breakers) if not breaker.is_open]
+        if not accounts:
+            return {}
+
+        async def fetch() -> Dict[str, List[Dict]]:
+            rest_positions = await self.market_data.get_positions_rest_bulk(
+                api_keys=[account.api_key for account in accounts],
+                market=market
+            )
+            result = {}
+            sdk_accounts = []
+            for account in accounts:
+                positions = rest_positions.get(account.api_key)
+                if positions is None:
+                    sdk_accounts.append(account)
+                else:
+                    result[account.name] = positions
+
+            if sdk_accounts:
+                # Если REST API не работает, пробуем SDK (тоже параллельно)
+                sdk_results = await asyncio.gather(
+                    *(self.clients[account.name].get_positions(market=market) for account in sdk_accounts),
+                    return_exceptions=True
+                )
+                for account, positions in zip(sdk_accounts, sdk_results):
+                    if isinstance(positions, Exception):
+                        if self._debug:
+                            self.logger.debug(f"{account.name}: ошибка получения позиции (REST и SDK): {positions}")
+                    else:
+                        result[account.name] = positions
+
+            return result
+
+        try:
+            result = await asyncio.wait_for(fetch(), timeout=timeout)
+        except asyncio.TimeoutError:
+            # Тайм-аут - это сбой опроса для всех аккаунтов тика: он тоже копится в breaker
+            self.logger.warning(f"{market}: опрос позиций не уложился в {timeout:.1f}с, пропускаем тик")
+            result = {}
+
+        # Логируем только переходы breaker'а, а не каждую ошибку
+        for account in accounts:
+            breaker = self._position_breakers[account.name]
+            if account.name in result:
+                if breaker.record_success():
+                    self.logger.info(f"{account.name}: опрос позиций восстановлен")
+            elif breaker.record_failure():
+                self.logger.warning(
+                    f"{account.name}: опрос позиций не отвечает {breaker.fail_max} раз подряд, "
+                    f"пауза {breaker.reset_timeout:.0f}с"
+                )
+
+        return result
+
     def _print_positions_summary(
         self,
         market: str,
@@ -1138,20 +1568,24 @@ class BatchTrader:
         closed_positions: list = None,
         batch_number: int = 0
     ):
-        """Вывести компактную сводку по позициям пачки"""
+        """Вывести компактную сводку по позициям пачки (списки PositionState)"""
+        # Сводка выводится только на уровне INFO - не форматируем ее впустую
+        if not self._info:
+            return
+
         width = 50  # Внутренняя ширина
         
         # Вычисляем суммарный PnL
-        total_long_pnl = sum(p['pnl_value'] for p in long_positions)
-        total_short_pnl = sum(p['pnl_value'] for p in short_positions)
+        total_long_pnl = sum(p.pnl_value for p in long_positions)
+        total_short_pnl = sum(p.pnl_value for p in short_positions)
         total_pnl = total_long_pnl + total_short_pnl
         
         # Получаем mark price из любой позиции
         mark_price = 0
         if long_positions:
-            mark_price = long_positions[0]['mark']
+            mark_price = long_positions[0].mark
         elif short_positions:
-            mark_price = short_positions[0]['mark']
+            mark_price = short_positions[0].mark
         
         # Форматируем mark price компактно
         try:
@@ -1181,11 +1615,11 @@ class BatchTrader:
         
         # LONG позиции
         if long_positions:
-            long_positions.sort(key=lambda x: x['account'])
+            long_positions.sort(key=lambda x: x.account)
             parts = []
             for pos in long_positions:
-                acc_short = pos['account'].replace('Account_', '')
-                pnl_val = pos['pnl_value']
+                acc_short = pos.account.replace('Account_', '')
+                pnl_val = pos.pnl_value
                 sign = "+" if pnl_val >= 0 else "-"
                 parts.append(f"{acc_short}:{sign}${abs(pnl_val):.2f}")
             
@@ -1196,11 +1630,11 @@ class BatchTrader:
         
         # SHORT позиции
         if short_positions:
-            short_positions.sort(key=lambda x: x['account'])
+            short_positions.sort(key=lambda x: x.account)
             parts = []
             for pos in short_positions:
-                acc_short = pos['account'].replace('Account_', '')
-                pnl_val = pos['pnl_value']
+                acc_short = pos.account.replace('Account_', '')
+                pnl_val = pos.pnl_value
                 sign = "+" if pnl_val >= 0 else "-"
                 parts.append(f"{acc_short}:{sign}${abs(pnl_val):.2f}")
             
@@ -1211,15 +1645,23 @@ class BatchTrader:
         
         self.logger.info(f"╚{'═' * width}╝")
 
-    def _calculate_pnl_percent(self, position: Dict) -> Decimal:
-        """Вычислить PnL в процентах относительно стоимости позиции (без плеча)"""
-        unrealized_pnl = Decimal(str(position.get('unrealisedPnl', 0)))
-        value = Decimal(str(position.get('value', 1)))
+    def _calculate_pnl_percent(self, position: Dict) -> float:
+        """
+        Вычислить PnL в процентах относительно стоимости позиции (без плеча)
+
+        Значение только для отображения и порогов - считаем во float,
+        Decimal нужен лишь для цен и размеров, уходящих на биржу.
+        """
+        try:
+            unrealized_pnl = float(position.get('unrealisedPnl', 0) or 0)
+            value = float(position.get('value', 1) or 0)
+        except (ValueError, TypeError):
+            return 0.0
 
         if value == 0:
-            return Decimal('0')
+            return 0.0
 
-        return (unrealized_pnl / value) * Decimal('100')
+        return unrealized_pnl / value * 100.0
 
     def _calculate_pnl_percent_margin(self, position: Dict) -> Decimal:
         """
@@ -1258,8 +1700,6 @@ class BatchTrader:
         position: Dict
     ):
         """Закрыть позицию"""
-        client = self.clients[account.name]
-
         try:
             side = position.get('side', '')
             size = position.get('size', 0)
@@ -1278,10 +1718,7 @@ class BatchTrader:
                 )
                 raise ValueError(f"Позиция имеет некорректный size: {size}")
 
-            size_decimal = Decimal(str(size))
-
-            # Противоположное направление для закрытия
-            close_side = "SELL" if side == "LONG" else "BUY"
+            size_decimal = _as_decimal(size)
 
             # Преобразуем unrealized_pnl в число (может быть строкой)
             try:
@@ -1294,77 +1731,112 @@ class BatchTrader:
                 f"(entry: {entry_price}, PnL: ${pnl_value:+.2f})"
             )
 
-            order_type = TRADING_SETTINGS.get('order_type', 'LIMIT')
-
-            if order_type == "MARKET":
-                # Маркет-ордер для закрытия
-                await client.place_market_order(
-                    market=market,
-                    side=close_side,
-                    amount=size_decimal,
-                    market_data_provider=self.market_data,
-                    reduce_only=True
-                )
-
-                # Проверяем что позиция закрылась
-                await asyncio.sleep(2)
-                positions = await client.get_positions(market=market)
-                if positions:
-                    self.logger.warning(
-                        f"{account.name}: позиция не закрылась маркет-ордером, повтор..."
-                    )
-                    raise Exception("Failed to close position with market order")
-
-                self.logger.info(f"✅ {account.name}: позиция закрыта маркет-ордером")
-            else:
-                # Для лимитных ордеров используем retry логику
-                success = await self._close_position_with_limit_retry(
-                    account=account,
-                    market=market,
-                    position=position
-                )
+            # Реализация закрытия выбрана по order_type при создании трейдера
+            success = await self._close_impl(
+                account=account,
+                market=market,
+                position=position
+            )
 
-                if not success:
-                    raise Exception("Failed to close position with limit orders")
+            if not success:
+                raise Exception(self._close_failure_message)
 
             return
 
         except Exception as e:
-            self.logger.error(
-                f"❌ {account.name}: ошибка закрытия позиции: {e}\n"
-                f"Traceback:\n{traceback.format_exc()}"
-            )
+            # Стек выводит вызывающий _close_position_by_account
+            self.logger.error(f"❌ {account.name}: ошибка закрытия позиции: {e}")
             raise
 
-    async def _close_position_by_account(
+    async def _close_position_with_market(
         self,
         account: AccountConfig,
         market: str,
-        reason: str
-    ):
-        """Закрыть позицию аккаунта по имени"""
-        try:
-            self.logger.info(
-                f"{account.name}: закрытие позиции по причине: {reason}"
-            )
+        position: Dict
+    ) -> bool:
+        """
+        Закрывает позицию маркет-ордером
 
-            # Пробуем сначала через REST API
-            try:
-                positions = await self.market_data.get_positions_rest(
-                    api_key=account.api_key,
-                    market=market
-                )
-            except Exception as e:
-                # Fallback на SDK
-                self.logger.debug(
-                    f"{account.name}: ошибка REST API ({e}), используем SDK"
-                )
-                client = self.clients[account.name]
-                positions = await client.get_positions(market=market)
+        Args:
+            account: Аккаунт
+            market: Рынок
+            position: Позиция для закрытия (side, size)
 
-            self.logger.debug(
-                f"{account.name}: получено позиций для закрытия: {len(positions) if positions else 0}"
-            )
+        Returns:
+            True если позиция закрылась, False если нет
+        """
+        client = self.clients[account.name]
+        close_side = "SELL" if position.get('side', '') == "LONG" else "BUY"
+
+        await client.place_market_order(
+            market=market,
+            side=close_side,
+            amount=_as_decimal(position.get('size', _DEC_ZERO)),
+            market_data_provider=self.market_data,
+            reduce_only=True
+        )
+
+        # Проверяем что позиция закрылась
+        if not await self._confirm_position_closed(client, market, account):
+            self.logger.warning(
+                f"{account.name}: позиция не закрылась маркет-ордером, повтор..."
+            )
+            return False
+
+        self.logger.info(f"✅ {account.name}: позиция закрыта маркет-ордером")
+        return True
+
+    def _get_cached_positions(self, account_name: str, market: str) -> Optional[List[Dict]]:
+        """
+        Позиции аккаунта из кеша приватного потока, если ему можно доверять
+
+        Args:
+            account_name: Имя аккаунта
+            market: Рынок (с суффиксом -USD)
+
+        Returns:
+            Список позиций (пустой если позиции нет) или None - нужен запрос к бирже
+        """
+        if not self._use_position_stream:
+            return None
+        return position_cache.get_positions(
+            account_name, market, WEBSOCKET_CONFIG['positions_wait_reconcile']
+        )
+
+    async def _close_position_by_account(
+        self,
+        account: AccountConfig,
+        market: str,
+        reason: str
+    ):
+        """Закрыть позицию аккаунта по имени"""
+        try:
+            self.logger.info(
+                f"{account.name}: закрытие позиции по причине: {reason}"
+            )
+
+            # Актуальный кеш приватного потока (частый случай - позиция уже закрыта по TP/SL),
+            # иначе REST API
+            positions = self._get_cached_positions(account.name, market)
+            if positions is None:
+                try:
+                    positions = await self.market_data.get_positions_rest(
+                        api_key=account.api_key,
+                        market=market
+                    )
+                except Exception as e:
+                    # Fallback на SDK
+                    if self._debug:
+                        self.logger.debug(
+                            f"{account.name}: ошибка REST API ({e}), используем SDK"
+                        )
+                    client = self.clients[account.name]
+                    positions = await client.get_positions(market=market)
+
+            if self._debug:
+                self.logger.debug(
+                    f"{account.name}: получено позиций для закрытия: {len(positions) if positions else 0}"
+                )
 
             if not positions:
                 self.logger.info(
@@ -1382,18 +1854,16 @@ class BatchTrader:
                 )
                 return
 
-            self.logger.debug(
-                f"{account.name}: закрытие позиции - market={pos_market}, "
-                f"side={position.get('side')}, size={position.get('size')}"
-            )
+            if self._debug:
+                self.logger.debug(
+                    f"{account.name}: закрытие позиции - market={pos_market}, "
+                    f"side={position.get('side')}, size={position.get('size')}"
+                )
 
             await self._close_position(account, market, position)
 
         except Exception as e:
-            self.logger.error(
-                f"{account.name}: ошибка закрытия позиции: {e}\n"
-                f"Traceback:\n{traceback.format_exc()}"
-            )
+            self.logger.error(f"{account.name}: ошибка закрытия позиции: {e}", exc_info=True)
             raise
 
     async def run_continuous_trading(
@@ -1437,7 +1907,7 @@ class BatchTrader:
 
                     # Задержка между пачками
                     if idx < len(batches):
-                        delay = random.uniform(*DELAYS['between_orders'])
+                        delay = random.uniform(*self._between_orders)
                         self.logger.info(
                             f"Задержка перед следующей пачкой: {delay:.1f} сек"
                         )
@@ -1451,7 +1921,7 @@ class BatchTrader:
 
                 # Задержка между циклами
                 if cycles is None or cycle_num < cycles:
-                    delay = random.uniform(*DELAYS['between_orders'])
+                    delay = random.uniform(*self._between_orders)
                     self.logger.info(
                         f"\nОжидание {delay:.1f} сек перед следующим циклом..."
                     )
@@ -1459,7 +1929,7 @@ class BatchTrader:
 
             except Exception as e:
                 self.logger.error(f"Ошибка в цикле {cycle_num}: {e}")
-                await asyncio.sleep(DELAYS['on_error'])
+                await asyncio.sleep(self._on_error_delay)
 
         self.logger.info("\nНепрерывная торговля завершена")
         self.logger.info(f"Финальная статистика: {self.stats}")
@@ -1484,44 +1954,117 @@ class BatchTrader:
         """
         # ШАГ 1: Пытаемся получить из WebSocket кеша
         if LIMIT_ORDER_CONFIG['websocket_enabled']:
-            cached_prices = orderbook_cache.get_prices(
+            cached_prices = orderbook_cache.get_top(
                 market,
                 max_age_seconds=LIMIT_ORDER_CONFIG['websocket_cache_max_age']
             )
 
             if cached_prices is not None:
+                if market in self._stale_markets:
+                    self._stale_markets.discard(market)
+                    self.logger.info(f"📊 {market}: WebSocket стакан снова актуален")
                 bid, ask = cached_prices
-                self.logger.debug(
-                    f"🚀 {market} цены из WebSocket кеша: "
-                    f"bid=${bid}, ask=${ask}"
-                )
+                if self._debug:
+                    self.logger.debug(
+                        f"🚀 {market} цены из WebSocket кеша: "
+                        f"bid=${bid}, ask=${ask}"
+                    )
                 return bid, ask
 
+            # Предупреждаем один раз при переходе рынка в "устаревшие", а не на каждый ордер
+            if market not in self._stale_markets:
+                self._stale_markets.add(market)
+                info = orderbook_cache.get_cache_status(market)
+                age = f"{info['age']:.1f}s" if info else "нет данных"
+                self.logger.warning(
+                    f"📊 {market}: WebSocket стакан устарел ({age}), используем резервный источник цен"
+                )
+
         # ШАГ 2: Fallback на REST API
         if LIMIT_ORDER_CONFIG['websocket_fallback_to_rest']:
-            self.logger.debug(f"🔄 {market} WebSocket кеш недоступен, используем REST API...")
+            # N аккаунтов пачки запрашивают цену одновременно - отдаем свежий
+            # результат из кеша или ждем уже идущий запрос по этому рынку
+            memo = self._rest_price_memo.get(market)
+            if memo is not None and time.monotonic() - memo[0] < LIMIT_ORDER_CONFIG['rest_price_memo_ttl']:
+                return memo[1], memo[2]
 
-            try:
-                stats = await self.market_data.get_market_stats(market)
-                # Используем mark_price как приближение
-                # В идеале нужен отдельный метод для получения orderbook через REST
-                mid_price = stats.mark_price
-                # Приблизительный spread 0.1%
-                spread = mid_price * Decimal('0.001')
-                bid = mid_price - spread / Decimal('2')
-                ask = mid_price + spread / Decimal('2')
+            task = self._rest_price_inflight.get(market)
+            if task is None:
+                task = asyncio.create_task(self._fetch_rest_orderbook_price(market))
+                self._rest_price_inflight[market] = task
+                task.add_done_callback(lambda _t, m=market: self._rest_price_inflight.pop(m, None))
+
+            # shield: отмена одного ожидающего не должна отменять общий запрос
+            return await asyncio.shield(task)
+
+        return None, None
 
+    async def _fetch_rest_orderbook_price(self, market: str) -> Tuple[Optional[Decimal], Optional[Decimal]]:
+        """
+        Получает приблизительные bid/ask через REST API (mark price ± 0.05%)
+
+        Args:
+            market: Рынок (BTC-USD)
+
+        Returns:
+            Tuple[bid_price, ask_price] или (None, None)
+        """
+        if self._debug:
+            self.logger.debug(f"🔄 {market} WebSocket кеш недоступен, используем REST API...")
+
+        try:
+            stats = await self.market_data.get_market_stats(market)
+            # Используем mark_price как приближение
+            # В идеале нужен отдельный метод для получения orderbook через REST
+            mid_price = stats.mark_price
+            # Приблизительный spread 0.1%
+            spread = mid_price * Decimal('0.001')
+            bid = mid_price - spread / Decimal('2')
+            ask = mid_price + spread / Decimal('2')
+
+            if self._debug:
                 self.logger.debug(
                     f"🔄 {market} цены из REST API: "
                     f"bid=${bid}, ask=${ask} (приблизительно)"
                 )
-                return bid, ask
+            self._rest_price_memo[market] = (time.monotonic(), bid, ask)
+            return bid, ask
 
-            except Exception as e:
-                self.logger.error(f"❌ {market}: ошибка получения цен через REST API: {e}")
-                return None, None
+        except Exception as e:
+            self.logger.error(f"❌ {market}: ошибка получения цен через REST API: {e}")
+            return None, None
 
-        return None, None
+    async def _wait_orders_cancelled(self, client: ExtendedClient, market: str):
+        """
+        Дождаться, пока отмененные ордера пропадут из списка открытых
+
+        Вместо фиксированной паузы в 1s: обычно ордера исчезают к первой же
+        проверке, ожидание не дольше cancel_confirm_timeout.
+
+        Args:
+            client: Клиент аккаунта
+            market: Рынок
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + LIMIT_ORDER_CONFIG['cancel_confirm_timeout']
+        interval = LIMIT_ORDER_CONFIG['cancel_confirm_interval']
+
+        while True:
+            try:
+                open_orders = await client.get_open_orders(
+                    market=market,
+                    market_data_provider=self.market_data
+                )
+            except Exception as e:
+                if self._debug:
+                    self.logger.debug(f"{market}: не удалось проверить отмену ордеров: {e}")
+                return
+            if not open_orders:
+                return
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(min(interval, remaining))
 
     async def _open_position_with_limit_retry(
         self,
@@ -1543,71 +2086,70 @@ class BatchTrader:
             True если позиция открылась, False если нет
         """
         client = self.clients[account.name]
+        # Настройки не меняются между попытками - читаем один раз
         max_retries = TRADING_SETTINGS['max_open_retries']
         execution_timeout = TRADING_SETTINGS['order_execution_timeout']
+        sl_enabled = self._sl_enabled
+        is_buy = side == "BUY"
+        # Ордер прошлой попытки уже отменен по ID - повторная полная отмена не нужна
+        previous_cancelled = False
 
         for attempt in range(max_retries):
             try:
                 # Отменяем все предыдущие открытые ордера для этого рынка
-                # ВАЖНО: Делаем это перед КАЖДОЙ попыткой, чтобы освободить баланс
-                cancelled = await client.cancel_all_orders(
-                    market=market,
-                    market_data_provider=self.market_data
-                )
-                self.logger.debug(
-                    f"{account.name} | cancel_all_orders returned: {cancelled} (attempt {attempt+1}/{max_retries})"
-                )
-                if cancelled > 0:
-                    # Даём время на обработку отмены
-                    await asyncio.sleep(1)
-
-                # Получаем bid/ask из WebSocket кеша или REST API
-                bid, ask = await self._get_orderbook_price(market)
+                # ВАЖНО: Делаем это перед попыткой, чтобы освободить баланс
+                # Цены получаем параллельно с отменой - они друг от друга не зависят
+                if not previous_cancelled:
+                    cancelled, (bid, ask) = await asyncio.gather(
+                        client.cancel_all_orders(
+                            market=market,
+                            market_data_provider=self.market_data
+                        ),
+                        self._get_orderbook_price(market)
+                    )
+                    if self._debug:
+                        self.logger.debug(
+                            f"{account.name} | cancel_all_orders returned: {cancelled} (attempt {attempt+1}/{max_retries})"
+                        )
+                    if cancelled > 0:
+                        # Ждем, пока биржа уберет ордера (и освободит баланс)
+                        await self._wait_orders_cancelled(client, market)
+                else:
+                    # Получаем bid/ask из WebSocket кеша или REST API
+                    bid, ask = await self._get_orderbook_price(market)
+                previous_cancelled = False
 
                 if bid is None or ask is None:
                     if attempt < max_retries - 1:
-                        await asyncio.sleep(random.uniform(2, 5))
+                        await asyncio.sleep(_backoff_delay(attempt))
                     continue
 
-                # Вычисляем цену с адаптивным offset
-                static_offset = Decimal(str(TRADING_SETTINGS['limit_order_offset_percent']))
-
-                if TRADING_SETTINGS['use_adaptive_offset']:
-                    spread_percent = orderbook_cache.get_spread_percent(market)
-                    if spread_percent is not None and spread_percent > 0:
-                        # Адаптивный offset = min(static_offset, spread/3)
-                        adaptive_offset = min(
-                            static_offset,
-                            spread_percent / Decimal('100') / Decimal('3')
-                        )
-                    else:
-                        adaptive_offset = static_offset
-                else:
-                    adaptive_offset = static_offset
+                # Множители цены: оффсет = min(static_offset, spread/3)
+                up_factor, down_factor = self._get_offset_multipliers(market)
 
                 # Рассчитываем цену лимитного ордера
-                if side == "BUY":
+                if is_buy:
                     # Покупка НИЖЕ bid (Maker)
-                    limit_price = bid * (Decimal('1') - adaptive_offset)
+                    limit_price = _PRICE_CTX.multiply(bid, down_factor)
                 else:
                     # Продажа ВЫШЕ ask (Maker)
-                    limit_price = ask * (Decimal('1') + adaptive_offset)
+                    limit_price = _PRICE_CTX.multiply(ask, up_factor)
 
                 # Конвертируем USD в количество базового актива
                 amount = size_usd / limit_price
                 amount = round_to_min_size(amount, market)
 
-                self.logger.debug(
-                    f"{account.name} | Расчет: size_usd=${size_usd}, "
-                    f"limit_price=${limit_price}, amount={amount}"
-                )
+                if self._debug:
+                    self.logger.debug(
+                        f"{account.name} | Расчет: size_usd=${size_usd}, "
+                        f"limit_price=${limit_price}, amount={amount}"
+                    )
 
                 # Округляем цену для вывода до 2 знаков после запятой
                 price_display = float(limit_price)
                 market_short = market.replace('-USD', '')
 
                 # Рассчитываем SL для прикрепления к ордеру
-                sl_enabled = POSITION_MANAGEMENT.get('stop_loss_enabled', False)
                 sl_trigger = None
                 sl_type = None
                 if sl_enabled:
@@ -1632,8 +2174,9 @@ class BatchTrader:
                     tp_sl_type=sl_type,
                 )
 
-                order_id = order.get('id') or order.get('order_id') or order.get('orderId', 'unknown')
-                self.logger.debug(f"{account.name} | Ордер размещен, ID={order_id}")
+                order_id = _extract_order_id(order)
+                if self._debug:
+                    self.logger.debug(f"{account.name} | Ордер размещен, ID={order_id}")
 
                 # Ждем исполнения ордера
                 position_opened = await self._wait_for_order_execution(
@@ -1649,17 +2192,19 @@ class BatchTrader:
                     )
                     return True
                 else:
-                    self.logger.debug(
-                        f"{account.name} | Ордер не исполнился за {execution_timeout}s, "
-                        f"отменяем..."
-                    )
+                    if self._debug:
+                        self.logger.debug(
+                            f"{account.name} | Ордер не исполнился за {execution_timeout}s, "
+                            f"отменяем..."
+                        )
 
                     # Отменяем ордер если ID известен
                     if order_id != 'unknown':
-                        await client.cancel_order(order_id)
+                        previous_cancelled = await client.cancel_order(order_id)
 
-                    # Проверяем не открылась ли позиция во время отмены
-                    await asyncio.sleep(2)
+                    # Проверяем не открылась ли позиция во время отмены: ждем, пока ордер
+                    # пропадет из открытых (вместо фиксированной паузы 2s)
+                    await self._wait_orders_cancelled(client, market)
                     positions = await client.get_positions(market=market)
 
                     if positions:
@@ -1671,13 +2216,15 @@ class BatchTrader:
                         return True
 
                     if attempt < max_retries - 1:
-                        self.logger.debug(f"{account.name} | Повторная попытка через 3s...")
-                        await asyncio.sleep(3)
+                        delay = _backoff_delay(attempt)
+                        if self._debug:
+                            self.logger.debug(f"{account.name} | Повторная попытка через {delay:.1f}s...")
+                        await asyncio.sleep(delay)
 
             except Exception as e:
                 self.logger.error(f"{account.name} | Ошибка открытия позиции: {e}")
                 if attempt < max_retries - 1:
-                    await asyncio.sleep(random.uniform(2, 5))
+                    await asyncio.sleep(_backoff_delay(attempt))
 
         self.logger.error(
             f"{account.name} | Не удалось открыть позицию {market} "
@@ -1685,6 +2232,61 @@ class BatchTrader:
         )
         return False
 
+    async def _get_live_positions(
+        self,
+        account: AccountConfig,
+        client: ExtendedClient,
+        market: str,
+        timeout: Optional[float] = None
+    ) -> List[Dict]:
+        """
+        Позиции аккаунта для ожидающих исполнения/закрытия
+
+        Пока приватный поток подключен и REST снапшот не старше positions_wait_reconcile,
+        позиции берутся из кеша без запроса; иначе - через SDK с обновлением снапшота.
+
+        Args:
+            account: Аккаунт
+            client: Клиент аккаунта
+            market: Рынок (с суффиксом -USD)
+            timeout: Ограничение на SDK запрос (сек), чтобы зависший запрос
+                не вышел за дедлайн ожидающего; None - без ограничения
+
+        Returns:
+            Список позиций по рынку
+        """
+        positions = self._get_cached_positions(account.name, market)
+        if positions is not None:
+            return positions
+
+        # Метка до запроса: обновление потока во время запроса новее ответа REST
+        since = position_cache.marker()
+        if timeout is None:
+            positions = await client.get_positions(market=market)
+        else:
+            positions = await asyncio.wait_for(client.get_positions(market=market), timeout=max(timeout, 0.1))
+        if self._use_position_stream:
+            position_cache.set_snapshot(account.name, market, positions, since)
+        return positions
+
+    async def _wait_position_update(self, account_name: str, remaining: float, check_interval: float):
+        """
+        Пауза между проверками позиции: при подключенном потоке - до первого обновления
+        позиций аккаунта (миллисекунды после исполнения), без потока - обычный check_interval
+
+        Args:
+            account_name: Имя аккаунта
+            remaining: Сколько осталось до дедлайна ожидающего (сек)
+            check_interval: Интервал опроса без потока (сек)
+        """
+        check_interval = max(check_interval, _MIN_POLL_INTERVAL)
+        if self._use_position_stream and position_cache.is_stream_connected(account_name):
+            await position_cache.wait_for_update(
+                account_name, min(remaining, WEBSOCKET_CONFIG['positions_wait_reconcile'])
+            )
+        else:
+            await asyncio.sleep(max(0.0, min(check_interval, remaining)))
+
     async def _wait_for_order_execution(
         self,
         account: AccountConfig,
@@ -1705,47 +2307,58 @@ class BatchTrader:
             True если позиция открылась, False если нет
         """
         client = self.clients[account.name]
-        start_time = time.time()
-        check_interval = LIMIT_ORDER_CONFIG['check_interval']
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        deadline = start_time + timeout
+        check_interval = max(LIMIT_ORDER_CONFIG['check_interval'], _MIN_POLL_INTERVAL)
 
-        self.logger.debug(
-            f"{account.name} | Ожидание исполнения ордера {market} {side} ({timeout}s)"
-        )
+        if self._debug:
+            self.logger.debug(
+                f"{account.name} | Ожидание исполнения ордера {market} {side} ({timeout}s)"
+            )
 
-        while (time.time() - start_time) < timeout:
+        while loop.time() < deadline:
             try:
-                positions = await client.get_positions(market=market)
+                positions = await self._get_live_positions(
+                    account, client, market, timeout=deadline - loop.time()
+                )
 
                 if positions:
                     position = positions[0]
                     pos_side = position.get('side', 'UNKNOWN')
-                    pos_size = abs(Decimal(str(position.get('size', 0))))
+                    pos_size = _abs_position_size(position)
 
-                    if pos_size > Decimal('0.0001'):
+                    if pos_size > _MIN_POSITION_SIZE:
                         # Проверяем что направление совпадает
                         if (side == "BUY" and pos_side == "LONG") or \
                            (side == "SELL" and pos_side == "SHORT"):
-                            elapsed = time.time() - start_time
+                            elapsed = loop.time() - start_time
                             self.logger.success(
                                 f"{account.name} | ✅ Ордер исполнен за {elapsed:.1f}s! "
                                 f"Позиция {market} {pos_side} открыта"
                             )
                             return True
 
-                elapsed = time.time() - start_time
-                remaining = timeout - elapsed
-                self.logger.debug(
-                    f"{account.name} | Проверка позиции {market}: не найдена, "
-                    f"осталось {remaining:.0f}s"
-                )
+                if self._debug:
+                    remaining = deadline - loop.time()
+                    self.logger.debug(
+                        f"{account.name} | Проверка позиции {market}: не найдена, "
+                        f"осталось {remaining:.0f}s"
+                    )
 
-                await asyncio.sleep(check_interval)
+                await self._wait_position_update(account.name, deadline - loop.time(), check_interval)
 
+            except asyncio.TimeoutError:
+                # SDK запрос не уложился в оставшееся время - дедлайн истек
+                if loop.time() >= deadline:
+                    break
+                await asyncio.sleep(max(0.0, min(check_interval, deadline - loop.time())))
             except Exception as e:
                 self.logger.warning(f"{account.name} | Ошибка проверки позиции: {e}")
-                await asyncio.sleep(check_interval)
+                await asyncio.sleep(max(0.0, min(check_interval, deadline - loop.time())))
 
-        self.logger.debug(f"{account.name} | Тайм-аут ожидания исполнения ордера {market}")
+        if self._debug:
+            self.logger.debug(f"{account.name} | Тайм-аут ожидания исполнения ордера {market}")
         return False
 
     async def _close_position_with_limit_retry(
@@ -1769,6 +2382,15 @@ class BatchTrader:
         max_retries = TRADING_SETTINGS['max_close_retries']
         close_timeout = TRADING_SETTINGS['position_close_timeout']
 
+        # external_id неисполненного ордера прошлой попытки: следующий ордер
+        # заменяет его на бирже (cancel-replace) вместо отдельных отмен
+        replace_order_id: Optional[str] = None
+
+        # Небольшой разброс старта, чтобы параллельные закрытия не били в биржу одновременно
+        start_jitter = RATE_LIMIT_CONFIG['close_start_jitter']
+        if start_jitter > 0:
+            await asyncio.sleep(random.uniform(0, start_jitter))
+
         for attempt in range(max_retries):
             try:
                 self.logger.info(
@@ -1776,66 +2398,47 @@ class BatchTrader:
                     f"закрытия позиции {market}"
                 )
 
-                # Отменяем все предыдущие ордера перед каждой попыткой
-                cancelled = await client.cancel_all_orders(
-                    market=market,
-                    market_data_provider=self.market_data
-                )
-                if cancelled > 0:
-                    self.logger.info(
-                        f"{account.name} | Отменено {cancelled} старых ордеров перед попыткой {attempt + 1}"
+                # Отменяем все предыдущие ордера перед попыткой
+                # (если есть ордер на замену - его отменит сама биржа при размещении нового)
+                if replace_order_id is None:
+                    cancelled = await client.cancel_all_orders(
+                        market=market,
+                        market_data_provider=self.market_data
                     )
-                    await asyncio.sleep(1)
+                    if cancelled > 0:
+                        self.logger.info(
+                            f"{account.name} | Отменено {cancelled} старых ордеров перед попыткой {attempt + 1}"
+                        )
+                        await self._wait_orders_cancelled(client, market)
 
-                # Получаем текущую позицию
+                # Позицию читаем только после отмены: пока ордер стоял, он мог частично исполниться
                 positions = await client.get_positions(market=market)
                 if not positions:
                     self.logger.info(f"{account.name} | Позиция {market} уже закрыта")
                     # Отменяем все оставшиеся ордера
                     await client.cancel_all_orders(market=market, market_data_provider=self.market_data)
                     return True
-
                 position = positions[0]
+
                 pos_side = position.get('side', 'UNKNOWN')
-                pos_size = abs(Decimal(str(position.get('size', 0))))
+                pos_size = abs(_as_decimal(position.get('size', _DEC_ZERO)))
 
                 # Получаем bid/ask
                 bid, ask = await self._get_orderbook_price(market)
                 if bid is None or ask is None:
                     self.logger.warning(f"{account.name} | Не удалось получить цены")
                     if attempt < max_retries - 1:
-                        await asyncio.sleep(random.uniform(2, 5))
+                        await asyncio.sleep(_backoff_delay(attempt))
                     continue
 
                 # Вычисляем цену закрывающего ордера
-                static_offset = Decimal(str(TRADING_SETTINGS['limit_order_offset_percent']))
-
-                if TRADING_SETTINGS['use_adaptive_offset']:
-                    spread_percent = orderbook_cache.get_spread_percent(market)
-                    if spread_percent and spread_percent > 0:
-                        adaptive_offset = min(
-                            static_offset,
-                            spread_percent / Decimal('100') / Decimal('3')
-                        )
-                    else:
-                        adaptive_offset = static_offset
-                else:
-                    adaptive_offset = static_offset
-
-                # Противоположное направление для закрытия
-                if pos_side == "LONG":
-                    # Закрываем продажей ВЫШЕ ask
-                    close_side = "SELL"
-                    limit_price = ask * (Decimal('1') + adaptive_offset)
-                else:
-                    # Закрываем покупкой НИЖЕ bid
-                    close_side = "BUY"
-                    limit_price = bid * (Decimal('1') - adaptive_offset)
+                close_side, limit_price = self._get_close_price(market, pos_side, bid, ask)
 
-                self.logger.info(
-                    f"{account.name} | Закрытие {pos_side} позиции: "
-                    f"{close_side} {pos_size} @ ${limit_price}"
-                )
+                if self._info:
+                    self.logger.info(
+                        f"{account.name} | Закрытие {pos_side} позиции: "
+                        f"{close_side} {pos_size} @ ${limit_price}"
+                    )
 
                 # Размещаем закрывающий лимитный ордер
                 order = await client.place_limit_order(
@@ -1844,20 +2447,22 @@ class BatchTrader:
                     amount=pos_size,
                     price=limit_price,
                     post_only=False,
-                    reduce_only=True
+                    reduce_only=True,
+                    previous_order_id=replace_order_id
                 )
+                replace_order_id = None
 
-                order_id = order.get('id') or order.get('order_id') or order.get('orderId', 'unknown')
+                order_id = _extract_order_id(order)
                 self.logger.info(f"{account.name} | Ордер на закрытие размещен, ID={order_id}")
 
                 # Ждем закрытия позиции
-                position_closed = await self._wait_for_position_close(
+                remaining_position = await self._wait_for_position_close(
                     account=account,
                     market=market,
                     timeout=close_timeout
                 )
 
-                if position_closed:
+                if remaining_position is None:
                     self.logger.success(f"{account.name} | ✅ Позиция {market} успешно закрыта")
                     # ВАЖНО: Отменяем все оставшиеся ордера после успешного закрытия
                     cancelled = await client.cancel_all_orders(
@@ -1875,18 +2480,25 @@ class BatchTrader:
                         f"отменяем ордер..."
                     )
 
-                    # Отменяем ордер если ID известен
-                    if order_id != 'unknown':
+                    if attempt < max_retries - 1 and order.get('external_id'):
+                        # Ордер будет заменен следующей попыткой
+                        replace_order_id = order['external_id']
+                    elif order_id != 'unknown':
+                        # Отменяем ордер если ID известен
                         await client.cancel_order(order_id)
 
                     if attempt < max_retries - 1:
-                        self.logger.debug(f"{account.name} | Повторная попытка через 3s...")
-                        await asyncio.sleep(3)
+                        delay = _backoff_delay(attempt)
+                        if self._debug:
+                            self.logger.debug(f"{account.name} | Повторная попытка через {delay:.1f}s...")
+                        await asyncio.sleep(delay)
 
             except Exception as e:
                 self.logger.error(f"{account.name} | Ошибка закрытия позиции: {e}")
+                # Состояние ордеров неизвестно - следующая попытка начнет с полной отмены
+                replace_order_id = None
                 if attempt < max_retries - 1:
-                    await asyncio.sleep(random.uniform(2, 5))
+                    await asyncio.sleep(_backoff_delay(attempt))
 
         self.logger.error(
             f"{account.name} | Не удалось закрыть позицию {market} "
@@ -1907,7 +2519,7 @@ class BatchTrader:
 
                 position = positions[0]
                 pos_side = position.get('side', 'UNKNOWN')
-                pos_size = abs(Decimal(str(position.get('size', 0))))
+                pos_size = abs(_as_decimal(position.get('size', _DEC_ZERO)))
 
                 close_side = "SELL" if pos_side == "LONG" else "BUY"
 
@@ -1935,7 +2547,7 @@ class BatchTrader:
         account: AccountConfig,
         market: str,
         timeout: float
-    ) -> bool:
+    ) -> Optional[Dict]:
         """
         Ожидает закрытия позиции
 
@@ -1945,32 +2557,40 @@ class BatchTrader:
             timeout: Таймаут в секундах
 
         Returns:
-            True если позиция закрылась, False если нет
+            None если позиция закрылась, иначе последний полученный снимок позиции
+            (пустой словарь, если позицию так и не удалось получить)
         """
         client = self.clients[account.name]
-        start_time = time.time()
-        check_interval = LIMIT_ORDER_CONFIG['check_interval']
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        check_interval = max(LIMIT_ORDER_CONFIG['check_interval'], _MIN_POLL_INTERVAL)
+        last_position: Dict = {}
 
-        while (time.time() - start_time) < timeout:
+        while loop.time() < deadline:
             try:
-                positions = await client.get_positions(market=market)
+                positions = await self._get_live_positions(
+                    account, client, market, timeout=deadline - loop.time()
+                )
 
                 if not positions:
-                    return True
+                    return None
 
                 # Проверяем размер позиции
                 position = positions[0]
-                pos_size = abs(Decimal(str(position.get('size', 0))))
-
-                if pos_size < Decimal('0.0001'):
-                    return True
+                if _abs_position_size(position) < _MIN_POSITION_SIZE:
+                    return None
 
-                await asyncio.sleep(check_interval)
+                last_position = position
+                await self._wait_position_update(account.name, deadline - loop.time(), check_interval)
 
-            except Exception as e:
-                await asyncio.sleep(check_interval)
+            except asyncio.TimeoutError:
+                if loop.time() >= deadline:
+                    break
+                await asyncio.sleep(max(0.0, min(check_interval, deadline - loop.time())))
+            except Exception:
+                await asyncio.sleep(max(0.0, min(check_interval, deadline - loop.time())))
 
-        return False
+        return last_position
 
     # ============================================================================
 
@@ -1994,22 +2614,31 @@ class BatchTrader:
         # Retry-логика для обнаружения всех позиций
         max_detection_rounds = 5  # Максимум 5 раундов поиска позиций
         detection_round = 0
+        closed_markets = set()
 
         while detection_round < max_detection_rounds:
             detection_round += 1
 
             if detection_round > 1:
+                # Поток всех аккаунтов подтверждает, что позиций нет - повторный REST поиск не нужен
+                if self._stream_confirms_flat(closed_markets):
+                    self.logger.success(f"✅ Все позиции закрыты после {detection_round-1} раундов!")
+                    break
                 self.logger.info("")
                 self.logger.info(f"{'='*60}")
                 self.logger.info(f"РАУНД {detection_round}: Повторный поиск незакрытых позиций...")
                 self.logger.info(f"{'='*60}")
                 await asyncio.sleep(3)  # Даём время API обновиться
 
-            # Собираем все аккаунты с открытыми позициями
-            all_positions = await self._fetch_all_positions()
+            # Собираем все аккаунты с открытыми позициями. В первом раунде не ждем
+            # медленные аккаунты дольше close_fetch_timeout - их позиции подберет следующий раунд
+            fetch_timeout = LIMIT_ORDER_CONFIG['close_fetch_timeout'] if detection_round == 1 else None
+            all_positions, pending_accounts = await self._fetch_all_positions(timeout=fetch_timeout)
 
-            # Если позиций нет - выходим
+            # Если позиций нет - выходим (если кто-то не ответил - ищем еще раз)
             if not all_positions:
+                if pending_accounts:
+                    continue
                 if detection_round == 1:
                     self.logger.info("Нет открытых позиций")
                 else:
@@ -2017,6 +2646,7 @@ class BatchTrader:
                 break
 
             # Закрываем найденные позиции
+            closed_markets.update(p['market'] for p in all_positions)
             await self._close_positions_batch(all_positions)
 
             # Если это был первый раунд и мы закрыли все успешно - продолжаем искать
@@ -2025,12 +2655,34 @@ class BatchTrader:
         # После всех раундов - массовая отмена ордеров
         await self._mass_cancel_all_accounts()
 
-    async def _fetch_all_positions(self) -> list:
+    def _stream_confirms_flat(self, markets) -> bool:
+        """
+        Подтверждает ли кеш приватного потока отсутствие позиций на всех аккаунтах
+
+        Args:
+            markets: Рынки закрытых позиций (к ним добавляются рынки из настроек)
+
+        Returns:
+            True если по всем аккаунтам и рынкам кешу можно доверять и позиций нет
+        """
+        if not self._use_position_stream or not self.accounts:
+            return False
+        check_markets = set(markets) | {f"{m}-USD" for m in TRADING_SETTINGS['markets']}
+        return all(
+            self._get_cached_positions(account.name, market) == []
+            for account in self.accounts
+            for market in check_markets
+        )
+
+    async def _fetch_all_positions(self, timeout: Optional[float] = None) -> Tuple[list, int]:
         """
         Получить все открытые позиции со всех аккаунтов
 
+        Args:
+            timeout: Сколько ждать ответы аккаунтов (сек); None - ждать всех
+
         Returns:
-            Список словарей с информацией о позициях
+            (список словарей с информацией о позициях, число аккаунтов без ответа за timeout)
         """
         all_positions = []
 
@@ -2039,36 +2691,43 @@ class BatchTrader:
             account_name = account.name
             client = self.clients.get(account_name)
             if not client:
-                self.logger.debug(f"{account_name}: клиент не найден, пропускаем")
+                if self._debug:
+                    self.logger.debug(f"{account_name}: клиент не найден, пропускаем")
                 return []
 
             positions_list = []
             try:
                 # Получаем ВСЕ позиции аккаунта через SDK (надежнее чем REST API)
-                self.logger.debug(f"{account_name}: запрос позиций через SDK...")
+                since = position_cache.marker()
                 positions = await client.get_positions()
 
-                self.logger.debug(
-                    f"{account_name}: SDK вернул {len(positions) if positions else 0} позиций, "
-                    f"тип: {type(positions)}"
-                )
+                if self._debug:
+                    self.logger.debug(
+                        f"{account_name}: SDK вернул {len(positions) if positions else 0} позиций, "
+                        f"тип: {type(positions)}"
+                    )
+
+                # Полный список позиций аккаунта - снапшот для кеша по всем торгуемым рынкам:
+                # ожидающие закрытия будут ждать событий потока без REST опроса
+                if self._use_position_stream:
+                    snapshot_markets = {f"{m}-USD" for m in TRADING_SETTINGS['markets']}
+                    snapshot_markets.update(pos.get('market') for pos in positions or [] if pos.get('market'))
+                    for snapshot_market in snapshot_markets:
+                        position_cache.set_snapshot(account_name, snapshot_market, positions or [], since)
 
                 if positions:
                     for pos in positions:
                         # Проверяем что позиция имеет размер > 0
-                        pos_size = pos.get('size', 0)
-                        try:
-                            pos_size = abs(float(pos_size)) if pos_size else 0
-                        except (ValueError, TypeError):
-                            pos_size = 0
+                        pos_size = _abs_position_size(pos)
 
                         market = pos.get('market', 'UNKNOWN')
                         side = pos.get('side', 'UNKNOWN')
 
-                        if pos_size > 0.0001:
-                            self.logger.debug(
-                                f"{account_name}: найдена позиция {market} {side} size={pos_size}"
-                            )
+                        if pos_size > _MIN_POSITION_SIZE:
+                            if self._debug:
+                                self.logger.debug(
+                                    f"{account_name}: найдена позиция {market} {side} size={pos_size}"
+                                )
                             positions_list.append({
                                 'account_name': account_name,
                                 'account': account,
@@ -2076,76 +2735,87 @@ class BatchTrader:
                                 'market': market,
                                 'position': pos
                             })
-                        else:
+                        elif self._debug:
                             self.logger.debug(
                                 f"{account_name}: позиция {market} {side} пропущена (size={pos_size} <= 0.0001)"
                             )
 
             except Exception as e:
                 self.logger.warning(f"{account_name}: REST API ошибка: {e}, пробуем SDK...")
-                # Пробуем fallback через SDK для всех рынков из настроек
-                try:
-                    for market in [f"{m}-USD" for m in TRADING_SETTINGS['markets']]:
-                        try:
-                            positions = await client.get_positions(market=market)
-                            self.logger.debug(
-                                f"{account_name}: SDK для {market} вернул {len(positions) if positions else 0} позиций"
-                            )
-                            if positions:
-                                for pos in positions:
-                                    pos_size = pos.get('size', 0)
-                                    try:
-                                        pos_size = abs(float(pos_size)) if pos_size else 0
-                                    except (ValueError, TypeError):
-                                        pos_size = 0
-
-                                    if pos_size > 0.0001:
-                                        self.logger.debug(
-                                            f"{account_name}: найдена позиция через SDK {market} size={pos_size}"
-                                        )
-                                        positions_list.append({
-                                            'account_name': account_name,
-                                            'account': account,
-                                            'client': client,
-                                            'market': market,
-                                            'position': pos
-                                        })
-                        except Exception as inner_e:
-                            self.logger.debug(f"{account_name}: SDK ошибка для {market}: {inner_e}")
-                except Exception:
-                    pass
-
-            self.logger.debug(f"{account_name}: итого найдено {len(positions_list)} позиций")
+                # Пробуем fallback через SDK для всех рынков из настроек (параллельно)
+                markets = [f"{m}-USD" for m in TRADING_SETTINGS['markets']]
+                sdk_results = await asyncio.gather(
+                    *(client.get_positions(market=market) for market in markets),
+                    return_exceptions=True
+                )
+                for market, positions in zip(markets, sdk_results):
+                    if isinstance(positions, Exception):
+                        if self._debug:
+                            self.logger.debug(f"{account_name}: SDK ошибка для {market}: {positions}")
+                        continue
+                    if self._debug:
+                        self.logger.debug(
+                            f"{account_name}: SDK для {market} вернул {len(positions) if positions else 0} позиций"
+                        )
+                    for pos in positions or []:
+                        pos_size = _abs_position_size(pos)
+
+                        if pos_size > _MIN_POSITION_SIZE:
+                            if self._debug:
+                                self.logger.debug(
+                                    f"{account_name}: найдена позиция через SDK {market} size={pos_size}"
+                                )
+                            positions_list.append({
+                                'account_name': account_name,
+                                'account': account,
+                                'client': client,
+                                'market': market,
+                                'position': pos
+                            })
+
+            if self._debug:
+                self.logger.debug(f"{account_name}: итого найдено {len(positions_list)} позиций")
             return positions_list
 
         # Параллельно запрашиваем позиции со всех аккаунтов
         self.logger.info(f"Проверка позиций на {len(self.accounts)} аккаунтах...")
-        self.logger.debug(f"Список аккаунтов: {[acc.name for acc in self.accounts]}")
-        fetch_tasks = [fetch_account_positions(acc) for acc in self.accounts]
-        results = await asyncio.gather(*fetch_tasks, return_exceptions=True)
+        if self._debug:
+            self.logger.debug(f"Список аккаунтов: {[acc.name for acc in self.accounts]}")
+        fetch_tasks = [asyncio.create_task(fetch_account_positions(acc)) for acc in self.accounts]
+        done, pending = await asyncio.wait(fetch_tasks, timeout=timeout) if fetch_tasks else (set(), set())
+        for task in pending:
+            task.cancel()
+        if pending:
+            self.logger.warning(
+                f"{len(pending)} аккаунт(ов) не ответили за {timeout}s - их позиции проверим в следующем раунде"
+            )
+        results = [
+            task.exception() if task.exception() is not None else task.result()
+            for task in fetch_tasks if task in done
+        ]
 
         # Собираем все позиции
-        self.logger.debug(f"Получено {len(results)} результатов от аккаунтов")
         for i, result in enumerate(results):
             if isinstance(result, Exception):
-                self.logger.debug(f"Результат {i}: исключение {type(result).__name__}: {result}")
+                if self._debug:
+                    self.logger.debug(f"Результат {i}: исключение {type(result).__name__}: {result}")
             elif result:
-                self.logger.debug(f"Результат {i}: {len(result)} позиций")
                 all_positions.extend(result)
-            else:
-                self.logger.debug(f"Результат {i}: пустой список")
+        if self._debug:
+            self.logger.debug(f"Получено {len(results)} результатов от аккаунтов, позиций: {len(all_positions)}")
 
         # Логируем найденные позиции
         if all_positions:
             self.logger.info(f"Найдено открытых позиций: {len(all_positions)}")
             # Подробный список позиций
-            for pos_info in all_positions:
-                self.logger.debug(
-                    f"  - {pos_info['account_name']}: {pos_info['market']} "
-                    f"size={pos_info['position'].get('size', 0)}"
-                )
+            if self._debug:
+                for pos_info in all_positions:
+                    self.logger.debug(
+                        f"  - {pos_info['account_name']}: {pos_info['market']} "
+                        f"size={pos_info['position'].get('size', 0)}"
+                    )
 
-        return all_positions
+        return all_positions, len(pending)
 
     async def _close_positions_batch(self, all_positions: list):
         """
@@ -2158,7 +2828,7 @@ class BatchTrader:
             return
 
         # Подготавливаем данные для закрытия
-        positions_to_close = []
+        positions_to_close: List[_CloseTask] = []
         for pos_info in all_positions:
             account_name = pos_info['account_name']
             account = pos_info['account']
@@ -2168,42 +2838,39 @@ class BatchTrader:
 
             # Определяем направление закрытия (противоположное открытой позиции)
             pos_side = position.get('side', 'UNKNOWN').upper()
-            current_size = abs(Decimal(str(position.get('size', '0'))))
+            current_size = abs(_as_decimal(position.get('size', _DEC_ZERO)))
 
-            if pos_side == 'LONG':
-                close_side = 'SELL'
-            elif pos_side == 'SHORT':
-                close_side = 'BUY'
-            else:
-                raw_size = Decimal(str(position.get('size', '0')))
+            close_side = _CLOSE_SIDE.get(pos_side)
+            if close_side is None:
+                raw_size = _as_decimal(position.get('size', _DEC_ZERO))
                 close_side = 'SELL' if raw_size > 0 else 'BUY'
 
-            positions_to_close.append({
-                'account_name': account_name,
-                'account': account,
-                'client': client,
-                'market': market,
-                'position': position,
-                'close_side': close_side,
-                'size': current_size,
-                'pos_side': pos_side
-            })
+            positions_to_close.append(_CloseTask(
+                key=(account_name, market),
+                account_name=account_name,
+                account=account,
+                client=client,
+                market=market,
+                position=position,
+                close_side=close_side,
+                size=current_size,
+                pos_side=pos_side
+            ))
 
         # Получаем настройки
         max_retries = TRADING_SETTINGS['max_close_retries']
         close_timeout = TRADING_SETTINGS['position_close_timeout']
         delay_range = DELAYS.get('between_accounts', [3, 5])  # Задержка между аккаунтами при закрытии
         use_market_fallback = LIMIT_ORDER_CONFIG.get('use_market_fallback', True)
-        order_type = TRADING_SETTINGS.get('order_type', 'LIMIT')
+        order_type = self._order_type
 
-        # Словарь для отслеживания статуса закрытия
-        close_status = {f"{p['account_name']}:{p['market']}": False for p in positions_to_close}
+        # Статус закрытия по ключу (аккаунт, рынок)
+        close_status = CloseStatus([p.key for p in positions_to_close])
 
         # === ЭТАП 1: Закрытие лимитными/маркет ордерами с retry ===
         for attempt in range(max_retries):
             # Фильтруем только незакрытые позиции
-            remaining = [p for p in positions_to_close 
-                        if not close_status[f"{p['account_name']}:{p['market']}"]]
+            remaining = [p for p in positions_to_close if not close_status.is_closed(p.key)]
             
             if not remaining:
                 break
@@ -2211,158 +2878,193 @@ class BatchTrader:
             if attempt > 0:
                 self.logger.info(f"Попытка закрытия {attempt + 1}/{max_retries} (осталось: {len(remaining)})...")
 
-                # Отменяем старые ордера перед каждой попыткой
-                cancel_tasks = []
-                for pos_info in remaining:
-                    cancel_tasks.append(
-                        pos_info['client'].cancel_all_orders(
-                            market=pos_info['market'],
-                            market_data_provider=self.market_data
-                        )
-                    )
-                results = await asyncio.gather(*cancel_tasks, return_exceptions=True)
-                cancelled_total = sum(r for r in results if isinstance(r, int))
-                if cancelled_total > 0:
-                    self.logger.debug(f"Отменено ордеров: {cancelled_total}")
-                await asyncio.sleep(1)
+                # Отменяем старые ордера перед каждой попыткой и ждем, пока они пропадут
+                # из открытых (вместо фиксированной паузы)
+                await self._cancel_close_orders(remaining)
+                await asyncio.gather(*(self._wait_orders_cancelled(p.client, p.market) for p in remaining))
 
-            # ЭТАП 1.1: Размещаем ордера последовательно с задержкой
+            # ЭТАП 1.1: Размещаем ордера по аккаунтам с задержкой между аккаунтами
+            # (лимитные ордера одного аккаунта - одним пакетом). Задержка отсчитывается
+            # между запусками, а не после ответа биржи - как при открытии позиций
             placed_orders = []  # Список успешно размещенных ордеров
-            
-            for i, pos_info in enumerate(remaining):
-
-                # Размещаем ордер
-                order_info = await self._place_close_order(
-                    account_name=pos_info['account_name'],
-                    account=pos_info['account'],
-                    client=pos_info['client'],
-                    market=pos_info['market'],
-                    side=pos_info['close_side'],
-                    size=pos_info['size'],
-                    order_type=order_type
-                )
-                
-                key = f"{pos_info['account_name']}:{pos_info['market']}"
-                
-                if order_info:
+            account_groups: Dict[str, List[_CloseTask]] = {}
+            for pos_info in remaining:
+                account_groups.setdefault(pos_info.account_name, []).append(pos_info)
+
+            async def place_group(group: List[_CloseTask], use_known_positions: bool) -> List[Optional[Dict]]:
+                # Размещаем ордера аккаунта
+                if order_type == "LIMIT":
+                    return await self._place_close_orders_for_account(
+                        group,
+                        use_known_positions=use_known_positions
+                    )
+                order_infos = []
+                for pos_info in group:
+                    order_infos.append(await self._place_close_order(
+                        account_name=pos_info.account_name,
+                        account=pos_info.account,
+                        client=pos_info.client,
+                        market=pos_info.market,
+                        side=pos_info.close_side,
+                        size=pos_info.size,
+                        order_type=order_type
+                    ))
+                return order_infos
+
+            groups = list(account_groups.values())
+            place_tasks = []
+            for i, group in enumerate(groups):
+                # На первой попытке позиции только что получены - не запрашиваем их повторно
+                place_tasks.append(asyncio.create_task(place_group(group, attempt == 0)))
+
+                # Задержка между аккаунтами
+                if i < len(groups) - 1:
+                    delay = random.uniform(delay_range[0], delay_range[1])
+                    await asyncio.sleep(delay)
+
+            group_results = await asyncio.gather(*place_tasks, return_exceptions=True)
+
+            for group, order_infos in zip(groups, group_results):
+                if isinstance(order_infos, BaseException):
+                    self.logger.error(
+                        f"{group[0].account_name}: ошибка размещения ордеров на закрытие: {order_infos}"
+                    )
+                    continue
+                for pos_info, order_info in zip(group, order_infos):
+                    if not order_info:
+                        continue
                     # Если позиция уже закрыта - сразу отмечаем успех
                     if order_info.get('already_closed'):
-                        close_status[key] = True
+                        close_status.mark_success(pos_info.key)
                     else:
                         placed_orders.append({
-                            'key': key,
-                            'account': pos_info['account'],
-                            'client': pos_info['client'],
-                            'market': pos_info['market'],
+                            'key': pos_info.key,
+                            'account': pos_info.account,
+                            'client': pos_info.client,
+                            'market': pos_info.market,
                             **order_info
                         })
 
-                # Задержка между размещением ордеров
-                if i < len(remaining) - 1:
-                    delay = random.uniform(delay_range[0], delay_range[1])
-                    await asyncio.sleep(delay)
-
             # ЭТАП 1.2: Ждем исполнения всех ордеров параллельно
             if placed_orders:
-                # Создаем задачи ожидания для всех размещенных ордеров
-                wait_tasks = []
-                for order_info in placed_orders:
-                    wait_task = asyncio.create_task(
-                        self._wait_for_position_close(
+                async def wait_close(order_info: Dict):
+                    key = order_info['key']
+                    try:
+                        remaining_position = await self._wait_for_position_close(
                             account=order_info['account'],
                             market=order_info['market'],
                             timeout=close_timeout
                         )
-                    )
-                    wait_tasks.append((order_info['key'], wait_task))
-                
-                # Собираем результаты параллельно
-                for key, task in wait_tasks:
-                    try:
-                        result = await asyncio.wait_for(task, timeout=close_timeout + 5)
-                        if result:
-                            close_status[key] = True
-                    except asyncio.TimeoutError:
-                        task.cancel()
+                        return key, remaining_position
                     except Exception as e:
-                        self.logger.debug(f"Ошибка ожидания закрытия {key}: {e}")
+                        if self._debug:
+                            self.logger.debug(f"Ошибка ожидания закрытия {key[0]}:{key[1]}: {e}")
+                        return key, {}
 
-            # Проверяем фактическое состояние позиций
-            await asyncio.sleep(2)
-            for pos_info in remaining:
-                key = f"{pos_info['account_name']}:{pos_info['market']}"
-                if not close_status[key]:
-                    try:
-                        positions = await pos_info['client'].get_positions(market=pos_info['market'])
-                        if not positions:
-                            close_status[key] = True
-                            self.logger.debug(f"Позиция {key} закрылась")
-                    except Exception:
-                        pass
+                # Создаем задачи ожидания для всех размещенных ордеров
+                wait_tasks = [asyncio.create_task(wait_close(o)) for o in placed_orders]
+
+                # Обрабатываем результаты по мере завершения, а не в порядке размещения
+                try:
+                    for next_done in asyncio.as_completed(wait_tasks, timeout=close_timeout + 5):
+                        key, remaining_position = await next_done
+                        if remaining_position is None:
+                            close_status.mark_success(key)
+                            if close_status.all_closed:
+                                break
+                except asyncio.TimeoutError:
+                    if self._debug:
+                        self.logger.debug("Тайм-аут ожидания закрытия позиций")
+                finally:
+                    for task in wait_tasks:
+                        if not task.done():
+                            task.cancel()
+
+            # Проверяем фактическое состояние неподтвержденных позиций (параллельно,
+            # один запрос всех позиций на аккаунт за раунд)
+            self._round_positions.clear()
+            unconfirmed = [p for p in remaining if not close_status.is_closed(p.key)]
+            if unconfirmed:
+                results = await asyncio.gather(
+                    *(self._get_round_positions(p.account_name, p.client, p.market) for p in unconfirmed),
+                    return_exceptions=True
+                )
+                for pos_info, positions in zip(unconfirmed, results):
+                    if not isinstance(positions, BaseException) and not positions:
+                        close_status.mark_success(pos_info.key)
+                        if self._debug:
+                            self.logger.debug(f"Позиция {pos_info.account_name}:{pos_info.market} закрылась")
 
         # === ЭТАП 2: Маркет-ордера для оставшихся позиций ===
-        remaining_after_limit = [p for p in positions_to_close 
-                                if not close_status[f"{p['account_name']}:{p['market']}"]]
+        remaining_after_limit = [p for p in positions_to_close if not close_status.is_closed(p.key)]
         
         if remaining_after_limit and use_market_fallback:
             self.logger.warning(f"Fallback: закрытие {len(remaining_after_limit)} позиций МАРКЕТ-ордерами...")
             
             # Отменяем все ордера перед маркет-закрытием
-            cancel_tasks = []
-            for pos_info in remaining_after_limit:
-                cancel_tasks.append(
-                    pos_info['client'].cancel_all_orders(
-                        market=pos_info['market'],
-                        market_data_provider=self.market_data
-                    )
-                )
-            await asyncio.gather(*cancel_tasks, return_exceptions=True)
-            await asyncio.sleep(1)
+            await self._cancel_close_orders(remaining_after_limit)
+            await asyncio.gather(
+                *(self._wait_orders_cancelled(p.client, p.market) for p in remaining_after_limit)
+            )
+            self._round_positions.clear()
 
-            # Закрываем маркет-ордерами
+            # Закрываем маркет-ордерами. Подтверждение каждой позиции запускается задачей сразу
+            # после размещения и идет параллельно с размещением следующих ордеров
+            confirm_tasks: Dict[Tuple[str, str], asyncio.Task] = {}
             for pos_info in remaining_after_limit:
-                key = f"{pos_info['account_name']}:{pos_info['market']}"
+                key = pos_info.key
                 try:
-                    # Проверяем актуальную позицию
-                    positions = await pos_info['client'].get_positions(market=pos_info['market'])
+                    # Проверяем актуальную позицию (другие рынки аккаунта - из того же запроса)
+                    positions = await self._get_round_positions(
+                        pos_info.account_name, pos_info.client, pos_info.market
+                    )
                     if not positions:
-                        close_status[key] = True
-                        self.logger.debug(f"{pos_info['account_name']}: {pos_info['market']} уже закрыта")
+                        close_status.mark_success(key)
+                        if self._debug:
+                            self.logger.debug(f"{pos_info.account_name}: {pos_info.market} уже закрыта")
                         continue
                     
                     position = positions[0]
-                    pos_size = abs(Decimal(str(position.get('size', 0))))
+                    pos_size = abs(_as_decimal(position.get('size', _DEC_ZERO)))
                     pos_side_actual = position.get('side', 'UNKNOWN').upper()
                     close_side = "SELL" if pos_side_actual == "LONG" else "BUY"
                     
-                    self.logger.debug(
-                        f"{pos_info['account_name']}: МАРКЕТ {pos_info['market']} {close_side} {pos_size}"
-                    )
+                    if self._debug:
+                        self.logger.debug(
+                            f"{pos_info.account_name}: МАРКЕТ {pos_info.market} {close_side} {pos_size}"
+                        )
                     
-                    await pos_info['client'].place_market_order(
-                        market=pos_info['market'],
+                    await pos_info.client.place_market_order(
+                        market=pos_info.market,
                         side=close_side,
                         amount=pos_size,
                         market_data_provider=self.market_data,
                         reduce_only=True
                     )
-                    
-                    await asyncio.sleep(2)
-                    
-                    # Проверяем что закрылась
-                    positions = await pos_info['client'].get_positions(market=pos_info['market'])
-                    if not positions:
-                        close_status[key] = True
-                        self.logger.debug(f"{pos_info['account_name']}: {pos_info['market']} закрыта маркетом")
-                    else:
-                        self.logger.warning(f"{pos_info['account_name']}: {pos_info['market']} НЕ закрылась")
-                        
+
+                    confirm_tasks[key] = asyncio.create_task(self._confirm_position_closed(
+                        pos_info.client, pos_info.market, pos_info.account
+                    ))
+
                 except Exception as e:
-                    self.logger.error(f"{pos_info['account_name']}: ошибка маркет-закрытия {pos_info['market']}: {e}")
+                    self.logger.error(f"{pos_info.account_name}: ошибка маркет-закрытия {pos_info.market}: {e}")
+
+            # Проверяем что закрылись
+            if confirm_tasks:
+                confirmed = await asyncio.gather(*confirm_tasks.values(), return_exceptions=True)
+                for (account_name, market), closed in zip(confirm_tasks, confirmed):
+                    if closed is True:
+                        close_status.mark_success((account_name, market))
+                        if self._debug:
+                            self.logger.debug(f"{account_name}: {market} закрыта маркетом")
+                    elif isinstance(closed, BaseException):
+                        self.logger.error(f"{account_name}: ошибка подтверждения закрытия {market}: {closed}")
+                    else:
+                        self.logger.warning(f"{account_name}: {market} НЕ закрылась")
 
         # === ЭТАП 3: Итоги ===
-        success_count = sum(1 for v in close_status.values() if v)
-        failed_count = len(close_status) - success_count
+        success_count = close_status.success
+        failed_count = close_status.total - success_count
 
         self.logger.info("=" * 60)
         self.logger.info(
@@ -2371,6 +3073,210 @@ class BatchTrader:
         )
         self.logger.info("=" * 60)
 
+    async def _cancel_close_orders(self, pos_infos: List[_CloseTask]):
+        """
+        Отменить ордера по рынкам позиций перед очередной попыткой закрытия
+
+        В режиме close_cancel_mode = 'mass' - один massCancel по всем рынкам аккаунта,
+        в режиме 'per_market' - cancel_all_orders на каждую пару (аккаунт, рынок).
+
+        Args:
+            pos_infos: Позиции (account_name, client, market)
+        """
+        if LIMIT_ORDER_CONFIG['close_cancel_mode'] != 'mass':
+            results = await asyncio.gather(
+                *(
+                    p.client.cancel_all_orders(market=p.market, market_data_provider=self.market_data)
+                    for p in pos_infos
+                ),
+                return_exceptions=True
+            )
+            cancelled_total = sum(r for r in results if isinstance(r, int))
+            if cancelled_total > 0:
+                if self._debug:
+                    self.logger.debug(f"Отменено ордеров: {cancelled_total}")
+            return
+
+        # Рынки каждого аккаунта - одним запросом
+        account_markets: Dict[str, Tuple[ExtendedClient, List[str]]] = {}
+        for p in pos_infos:
+            client, markets = account_markets.setdefault(p.account_name, (p.client, []))
+            if p.market not in markets:
+                markets.append(p.market)
+
+        names = list(account_markets)
+        results = await asyncio.gather(
+            *(
+                client.mass_cancel_markets(markets, market_data_provider=self.market_data)
+                for client, markets in account_markets.values()
+            ),
+            return_exceptions=True
+        )
+        failed = [name for name, ok in zip(names, results) if ok is not True]
+        if failed:
+            # Запасной путь - отмена по рынкам через список открытых ордеров
+            if self._debug:
+                self.logger.debug(f"massCancel не прошел для: {', '.join(failed)}, отменяем по рынкам")
+            await asyncio.gather(
+                *(
+                    account_markets[name][0].cancel_all_orders(market=market, market_data_provider=self.market_data)
+                    for name in failed
+                    for market in account_markets[name][1]
+                ),
+                return_exceptions=True
+            )
+
+    async def _get_round_positions(
+        self,
+        account_name: str,
+        client: ExtendedClient,
+        market: str
+    ) -> List[Dict]:
+        """
+        Позиции аккаунта по рынку из общего запроса всех позиций аккаунта
+
+        Первый вызов по аккаунту запрашивает все его позиции, остальные (по другим
+        рынкам и параллельные) ждут этот же запрос. Результат живет round_positions_ttl
+        секунд или до очистки self._round_positions на границе раунда.
+
+        Args:
+            account_name: Имя аккаунта
+            client: Клиент аккаунта
+            market: Рынок (с суффиксом -USD)
+
+        Returns:
+            Список позиций по рынку
+        """
+        now = time.monotonic()
+        entry = self._round_positions.get(account_name)
+        if entry is None or now - entry[0] > LIMIT_ORDER_CONFIG['round_positions_ttl']:
+            entry = self._round_positions[account_name] = (now, asyncio.ensure_future(client.get_positions()))
+
+        try:
+            positions = await asyncio.shield(entry[1])
+        except Exception:
+            # Неудачный запрос не кешируем
+            if self._round_positions.get(account_name) is entry:
+                del self._round_positions[account_name]
+            raise
+
+        market = market.upper()
+        return [p for p in positions or [] if str(p.get('market', '')).upper() == market]
+
+    def _get_offset_multipliers(self, market: str) -> Tuple[Decimal, Decimal]:
+        """
+        Множители цены лимитного ордера с учетом адаптивного оффсета
+
+        Оффсет = min(limit_order_offset_percent, spread/3), если включен use_adaptive_offset.
+        Статический оффсет - готовые множители, адаптивный - через кеш множителей.
+
+        Args:
+            market: Рынок
+
+        Returns:
+            (up, down): цена выше ask = ask * up, цена ниже bid = bid * down
+        """
+        if _USE_ADAPTIVE:
+            spread_percent = orderbook_cache.get_spread_percent(market)
+            if spread_percent and spread_percent > 0:
+                adaptive_offset = _PRICE_CTX.divide(spread_percent, _DEC_THREE_HUNDRED)
+                if adaptive_offset < _OFFSET:
+                    return get_offset_factors(adaptive_offset)
+        return _MULT_UP, _MULT_DOWN
+
+    def _get_close_price(
+        self,
+        market: str,
+        pos_side: str,
+        bid: Decimal,
+        ask: Decimal
+    ) -> Tuple[str, Decimal]:
+        """
+        Рассчитать сторону и цену закрывающего лимитного ордера
+
+        Args:
+            market: Рынок
+            pos_side: Сторона позиции (LONG/SHORT)
+            bid: Лучший bid
+            ask: Лучший ask
+
+        Returns:
+            (close_side, limit_price): LONG закрывается SELL выше ask, SHORT - BUY ниже bid
+        """
+        up_factor, down_factor = self._get_offset_multipliers(market)
+
+        # Неизвестная сторона обрабатывается как SHORT (закрытие покупкой ниже bid)
+        if _PRICE_SELECT_IS_ASK.get(pos_side, False):
+            return _CLOSE_SIDE[pos_side], _PRICE_CTX.multiply(ask, up_factor)
+        return "BUY", _PRICE_CTX.multiply(bid, down_factor)
+
+    async def _compute_close_plan(
+        self,
+        client: ExtendedClient,
+        market: str,
+        known_position: Optional[Dict] = None
+    ) -> Optional[Dict]:
+        """
+        Получить позицию и стакан (из кеша или параллельно с позицией)
+        и рассчитать закрывающий лимитный ордер
+
+        Args:
+            client: Клиент аккаунта
+            market: Рынок
+            known_position: Уже известная актуальная позиция (side/size) - запрос позиций пропускается
+
+        Returns:
+            {'close_side', 'pos_side', 'size', 'price'}, {'already_closed': True} если
+            позиции нет, или None если не удалось получить цены
+        """
+        # Свежий стакан из WebSocket кеша читаем синхронно, без лишней корутины
+        prices = None
+        if LIMIT_ORDER_CONFIG['websocket_enabled']:
+            prices = orderbook_cache.get_top(
+                market,
+                max_age_seconds=LIMIT_ORDER_CONFIG['websocket_cache_max_age']
+            )
+
+        if known_position is not None:
+            positions = [known_position]
+            if prices is None:
+                try:
+                    prices = await self._get_orderbook_price(market)
+                except Exception as e:
+                    prices = e
+        elif prices is not None:
+            positions = await client.get_positions(market=market)
+        else:
+            positions, prices = await asyncio.gather(
+                client.get_positions(market=market),
+                self._get_orderbook_price(market),
+                return_exceptions=True
+            )
+        # Ошибку получения позиций пробрасываем как раньше, ошибку стакана считаем отсутствием цен
+        if isinstance(positions, BaseException):
+            raise positions
+        if not positions:
+            return {'already_closed': True}
+        if isinstance(prices, BaseException):
+            if self._debug:
+                self.logger.debug(f"Ошибка получения цен {market}: {prices}")
+            return None
+
+        bid, ask = prices
+        if bid is None or ask is None:
+            return None
+
+        position = positions[0]
+        pos_side = position.get('side', 'UNKNOWN')
+        close_side, limit_price = self._get_close_price(market, pos_side, bid, ask)
+
+        return {
+            'close_side': close_side,
+            'pos_side': pos_side,
+            'size': abs(_as_decimal(position.get('size', _DEC_ZERO))),
+            'price': limit_price
+        }
+
     async def _place_close_order(
         self,
         account_name: str,
@@ -2379,7 +3285,8 @@ class BatchTrader:
         market: str,
         side: str,
         size: Decimal,
-        order_type: str = "LIMIT"
+        order_type: str = "LIMIT",
+        known_position: Optional[Dict] = None
     ) -> Optional[Dict]:
         """
         Размещает ордер на закрытие позиции (без ожидания исполнения)
@@ -2392,6 +3299,7 @@ class BatchTrader:
             side: Сторона закрытия (BUY/SELL)
             size: Размер
             order_type: Тип ордера (LIMIT/MARKET)
+            known_position: Актуальная позиция, если уже известна (без запроса позиций)
             
         Returns:
             Dict с информацией о размещенном ордере или None при ошибке
@@ -2400,42 +3308,13 @@ class BatchTrader:
             size = round_to_min_size(size, market)
             
             if order_type == "LIMIT":
-                # Получаем текущую позицию
-                positions = await client.get_positions(market=market)
-                if not positions:
-                    return {'already_closed': True}
-                    
-                position = positions[0]
-                pos_side = position.get('side', 'UNKNOWN')
-                pos_size = abs(Decimal(str(position.get('size', 0))))
-                
-                # Получаем bid/ask
-                bid, ask = await self._get_orderbook_price(market)
-                if bid is None or ask is None:
-                    return None
-                
-                # Вычисляем цену
-                static_offset = Decimal(str(TRADING_SETTINGS['limit_order_offset_percent']))
-                
-                if TRADING_SETTINGS['use_adaptive_offset']:
-                    spread_percent = orderbook_cache.get_spread_percent(market)
-                    if spread_percent and spread_percent > 0:
-                        adaptive_offset = min(
-                            static_offset,
-                            spread_percent / Decimal('100') / Decimal('3')
-                        )
-                    else:
-                        adaptive_offset = static_offset
-                else:
-                    adaptive_offset = static_offset
-                
-                # Противоположное направление для закрытия
-                if pos_side == "LONG":
-                    close_side = "SELL"
-                    limit_price = ask * (Decimal('1') + adaptive_offset)
-                else:
-                    close_side = "BUY"
-                    limit_price = bid * (Decimal('1') - adaptive_offset)
+                plan = await self._compute_close_plan(client, market, known_position)
+                if plan is None or plan.get('already_closed'):
+                    return plan
+
+                close_side = plan['close_side']
+                pos_size = plan['size']
+                limit_price = plan['price']
                 
                 # Размещаем закрывающий лимитный ордер
                 order = await client.place_limit_order(
@@ -2447,7 +3326,7 @@ class BatchTrader:
                     reduce_only=True
                 )
                 
-                order_id = order.get('id') or order.get('order_id') or order.get('orderId', 'unknown')
+                order_id = _extract_order_id(order)
                 
                 return {
                     'order_id': order_id,
@@ -2467,7 +3346,7 @@ class BatchTrader:
                     reduce_only=True
                 )
                 
-                order_id = order.get('id') or order.get('order_id') or order.get('orderId', 'unknown') if order else 'unknown'
+                order_id = _extract_order_id(order)
                 
                 return {
                     'order_id': order_id,
@@ -2480,6 +3359,80 @@ class BatchTrader:
             self.logger.error(f"{account_name} | Ошибка размещения ордера закрытия {market}: {e}")
             return None
 
+    async def _place_close_orders_for_account(
+        self,
+        group: List[_CloseTask],
+        use_known_positions: bool = False
+    ) -> List[Optional[Dict]]:
+        """
+        Разместить закрывающие лимитные ордера по всем позициям одного аккаунта пакетом
+
+        Args:
+            group: Позиции одного аккаунта (элементы positions_to_close)
+            use_known_positions: Позиции в group свежие - не перезапрашивать их
+
+        Returns:
+            Список в порядке group: как у _place_close_order (dict ордера,
+            {'already_closed': True} или None при ошибке)
+        """
+        account_name = group[0].account_name
+        client = group[0].client
+        results: List[Optional[Dict]] = [None] * len(group)
+
+        # Планы закрытия по всем рынкам аккаунта параллельно
+        plans = await asyncio.gather(
+            *(self._compute_close_plan(
+                client,
+                pos_info.market,
+                pos_info.position if use_known_positions else None
+            ) for pos_info in group),
+            return_exceptions=True
+        )
+
+        specs = []
+        planned = []  # (индекс в group, план) для каждого ордера из specs
+        for idx, (pos_info, plan) in enumerate(zip(group, plans)):
+            if isinstance(plan, BaseException):
+                self.logger.error(
+                    f"{account_name} | Ошибка подготовки закрытия {pos_info.market}: {plan}"
+                )
+                continue
+            if plan is None:
+                continue
+            if plan.get('already_closed'):
+                results[idx] = plan
+                continue
+            specs.append({
+                'market': pos_info.market,
+                'side': plan['close_side'],
+                'amount': plan['size'],
+                'price': plan['price'],
+                'post_only': False,
+                'reduce_only': True
+            })
+            planned.append((idx, plan))
+
+        if not specs:
+            return results
+
+        orders = await client.place_limit_orders_batch(specs)
+
+        for (idx, plan), order in zip(planned, orders):
+            if isinstance(order, BaseException):
+                self.logger.error(
+                    f"{account_name} | Ошибка размещения ордера закрытия {group[idx].market}: {order}"
+                )
+                continue
+            results[idx] = {
+                'order_id': _extract_order_id(order),
+                'order_type': 'LIMIT',
+                'close_side': plan['close_side'],
+                'size': plan['size'],
+                'price': plan['price']
+            }
+
+        return results
+
     async def _close_single_position_one_attempt(
         self,
         account_name: str,
@@ -2488,7 +3441,8 @@ class BatchTrader:
         market: str,
         side: str,
         size: Decimal,
-        order_type: str = "LIMIT"
+        order_type: str = "LIMIT",
+        known_position: Optional[Dict] = None
     ) -> bool:
         """
         Одна попытка закрытия позиции (без retry внутри)
@@ -2501,57 +3455,33 @@ class BatchTrader:
             side: Сторона закрытия (BUY/SELL)
             size: Размер
             order_type: Тип ордера (LIMIT/MARKET)
+            known_position: Актуальная позиция, если уже известна (без запроса позиций)
             
         Returns:
             True если позиция закрылась, False если нет
         """
         try:
             size = round_to_min_size(size, market)
-            close_timeout = TRADING_SETTINGS['position_close_timeout']
+            close_timeout = _CLOSE_TIMEOUT
             
             if order_type == "LIMIT":
-                # Получаем текущую позицию
-                positions = await client.get_positions(market=market)
-                if not positions:
-                    return True  # Уже закрыта
-                    
-                position = positions[0]
-                pos_side = position.get('side', 'UNKNOWN')
-                pos_size = abs(Decimal(str(position.get('size', 0))))
-                
-                # Получаем bid/ask
-                bid, ask = await self._get_orderbook_price(market)
-                if bid is None or ask is None:
+                plan = await self._compute_close_plan(client, market, known_position)
+                if plan is None:
                     self.logger.warning(f"{account_name} | Не удалось получить цены для {market}")
                     return False
+                if plan.get('already_closed'):
+                    return True
+
+                pos_side = plan['pos_side']
+                close_side = plan['close_side']
+                pos_size = plan['size']
+                limit_price = plan['price']
                 
-                # Вычисляем цену
-                static_offset = Decimal(str(TRADING_SETTINGS['limit_order_offset_percent']))
-                
-                if TRADING_SETTINGS['use_adaptive_offset']:
-                    spread_percent = orderbook_cache.get_spread_percent(market)
-                    if spread_percent and spread_percent > 0:
-                        adaptive_offset = min(
-                            static_offset,
-                            spread_percent / Decimal('100') / Decimal('3')
-                        )
-                    else:
-                        adaptive_offset = static_offset
-                else:
-                    adaptive_offset = static_offset
-                
-                # Противоположное направление для закрытия
-                if pos_side == "LONG":
-                    close_side = "SELL"
-                    limit_price = ask * (Decimal('1') + adaptive_offset)
-                else:
-                    close_side = "BUY"
-                    limit_price = bid * (Decimal('1') - adaptive_offset)
-                
-                self.logger.info(
-                    f"{account_name} | Закрытие {pos_side} позиции: "
-                    f"{close_side} {pos_size} @ ${limit_price}"
-                )
+                if self._info:
+                    self.logger.info(
+                        f"{account_name} | Закрытие {pos_side} позиции: "
+                        f"{close_side} {pos_size} @ ${limit_price}"
+                    )
                 
                 # Размещаем закрывающий лимитный ордер
                 order = await client.place_limit_order(
@@ -2563,18 +3493,18 @@ class BatchTrader:
                     reduce_only=True
                 )
                 
-                order_id = order.get('id') or order.get('order_id') or order.get('orderId', 'unknown')
+                order_id = _extract_order_id(order)
                 self.logger.info(f"{account_name} | Ордер на закрытие размещен, ID={order_id}")
                 
                 # Ждем закрытия позиции
                 self.logger.info(f"{account_name} | Ожидание закрытия позиции {market} ({close_timeout}s)")
-                position_closed = await self._wait_for_position_close(
+                remaining_position = await self._wait_for_position_close(
                     account=account,
                     market=market,
                     timeout=close_timeout
                 )
                 
-                if position_closed:
+                if remaining_position is None:
                     return True
                 else:
                     self.logger.warning(
@@ -2596,10 +3526,7 @@ class BatchTrader:
                     reduce_only=True
                 )
                 
-                await asyncio.sleep(2)
-                
-                positions = await client.get_positions(market=market)
-                if not positions:
+                if await self._confirm_position_closed(client, market, account):
                     return True
                 else:
                     self.logger.warning(f"{account_name} | Позиция {market} не закрылась маркетом")
@@ -2609,6 +3536,40 @@ class BatchTrader:
             self.logger.error(f"{account_name} | Ошибка закрытия {market}: {e}")
             return False
 
+    async def _confirm_position_closed(
+        self,
+        client: ExtendedClient,
+        market: str,
+        account: Optional[AccountConfig] = None
+    ) -> bool:
+        """
+        Подтвердить закрытие позиции после маркет-ордера
+
+        При подключенном приватном потоке аккаунта - ожиданием события закрытия,
+        иначе опросом с нарастающей паузой.
+
+        Args:
+            client: Клиент аккаунта
+            market: Рынок
+            account: Аккаунт (нужен для ожидания по потоку)
+
+        Returns:
+            True как только позиция пропала, False если она осталась после всех проверок
+        """
+        if account is not None and self._use_position_stream and position_cache.is_stream_connected(account.name):
+            remaining = await self._wait_for_position_close(
+                account=account,
+                market=market,
+                timeout=_MARKET_CLOSE_CONFIRM_TIMEOUT
+            )
+            return remaining is None
+
+        for delay in _MARKET_CLOSE_POLL_DELAYS:
+            await asyncio.sleep(delay)
+            if not await client.get_positions(market=market):
+                return True
+        return False
+
     async def _close_single_position(
         self,
         account_name: str,
@@ -2627,14 +3588,10 @@ class BatchTrader:
         try:
             # Округляем размер
             size = round_to_min_size(size, market)
-            order_type = TRADING_SETTINGS.get('order_type', 'LIMIT')
+            order_type = self._order_type
 
             # Находим аккаунт
-            account = None
-            for acc in self.accounts:
-                if acc.name == account_name:
-                    account = acc
-                    break
+            account = self._accounts_by_name.get(account_name)
 
             if not account:
                 self.logger.error(f"{account_name}: аккаунт не найден")
@@ -2654,10 +3611,7 @@ class BatchTrader:
                     reduce_only=True
                 )
 
-                await asyncio.sleep(2)
-
-                positions = await client.get_positions(market=market)
-                if not positions:
+                if await self._confirm_position_closed(client, market, account):
                     self.logger.success(
                         f"{account_name}: позиция закрыта на {market}"
                     )
@@ -2676,7 +3630,7 @@ class BatchTrader:
                 # Формируем структуру позиции для метода
                 position = {
                     'side': 'LONG' if side == 'SELL' else 'SHORT',  # Обратная сторона
-                    'size': float(size),
+                    'size': size,
                     'market': market
                 }
 
@@ -2713,20 +3667,42 @@ class BatchTrader:
         """
         self.logger.info("Отмена всех ордеров...")
 
-        try:
-            # Запускаем mass cancel параллельно для всех аккаунтов
-            cancel_tasks = []
-            for account_name, client in self.clients.items():
-                cancel_tasks.append(
-                    client.mass_cancel_all_orders(market_data_provider=self.market_data)
-                )
+        # Аккаунты без прокси делят один пул соединений - ограничиваем одновременные отмены,
+        # а зависший аккаунт отрезаем по таймауту
+        semaphore = asyncio.Semaphore(RATE_LIMIT_CONFIG['max_concurrent_cancels'])
+        cancel_timeout = RATE_LIMIT_CONFIG['mass_cancel_timeout']
 
-            # Ждем завершения всех запросов
-            results = await asyncio.gather(*cancel_tasks, return_exceptions=True)
+        async def cancel_account(account_name: str, client: ExtendedClient):
+            try:
+                async with semaphore:
+                    return account_name, await asyncio.wait_for(
+                        client.mass_cancel_all_orders(market_data_provider=self.market_data),
+                        timeout=cancel_timeout
+                    )
+            except Exception as e:
+                return account_name, e
 
-            # Подсчитываем результаты
-            success_count = sum(1 for r in results if r and not isinstance(r, Exception))
-            failed_count = len(results) - success_count
+        try:
+            # Запускаем mass cancel параллельно для всех аккаунтов
+            cancel_tasks = [
+                asyncio.create_task(cancel_account(account_name, client))
+                for account_name, client in self.clients.items()
+            ]
+
+            # Обрабатываем результаты по мере поступления (медленный аккаунт не задерживает лог)
+            success_count = 0
+            failed_count = 0
+            for next_done in asyncio.as_completed(cancel_tasks):
+                account_name, result = await next_done
+                if result and not isinstance(result, Exception):
+                    success_count += 1
+                else:
+                    failed_count += 1
+                    if isinstance(result, asyncio.TimeoutError):
+                        self.logger.warning(f"{account_name} | Mass cancel: биржа не ответила за {cancel_timeout}s")
+                        continue
+                    reason = f": {result}" if isinstance(result, Exception) else ""
+                    self.logger.warning(f"{account_name} | Mass cancel не выполнен{reason}")
 
             if failed_count > 0:
                 self.logger.warning(f"Mass cancel: {success_count}/{len(self.clients)} OK, {failed_count} ошибок")
@@ -2746,7 +3722,8 @@ class BatchTrader:
                 try:
                     await self.ws_manager.stop()
                 except Exception as e:
-                    self.logger.debug(f"Ошибка закрытия WebSocket Manager: {e}")
+                    if self._debug:
+                        self.logger.debug(f"Ошибка закрытия WebSocket Manager: {e}")
 
             # Закрываем все клиенты параллельно
             tasks = []
@@ -2762,10 +3739,13 @@ class BatchTrader:
             # Проверяем ошибки
             for i, result in enumerate(results):
                 if isinstance(result, Exception):
-                    self.logger.debug(f"Ошибка закрытия соединения #{i}: {result}")
+                    if self._debug:
+                        self.logger.debug(f"Ошибка закрытия соединения #{i}: {result}")
 
-            # Даем время на корректное закрытие всех соединений
-            await asyncio.sleep(0.5)
+            # Общий пул закрываем после всех сессий, которые его использовали
+            if self._shared_connector is not None:
+                await self._shared_connector.close()
+                self._shared_connector = None
 
             self.logger.debug("Все соединения закрыты")
 
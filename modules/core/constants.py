@@ -16,6 +16,25 @@ DATABASE_FILE = Path("database") / "extended_bot.db"
 RETRY_SETTINGS = {
     'max_retries': 3,
     'base_delay': 1.0,  # Base delay (exponential backoff)
+    'max_delay': 30.0,  # Backoff cap (sec)
+    'jitter': 0.5,      # Random extra delay, fraction of the backoff step
+}
+
+# === Rate Limit Settings ===
+RATE_LIMIT_CONFIG = {
+    'requests_per_second': 8,     # Token bucket for batch-wide bursts (leverage updates)
+    'positions_breaker_fail_max': 3,      # Failed position polls in a row before pausing an account
+    'positions_breaker_reset': 30.0,      # Pause of position polling for that account (sec)
+    'close_start_jitter': 0.5,            # Random delay before a limit close starts (sec)
+    'max_concurrent_cancels': 20,         # Max accounts mass-cancelled at once by the final sweep
+    'mass_cancel_timeout': 5.0,           # Per-account mass cancel timeout in the final sweep (sec)
+}
+
+# === HTTP Connection Pool (accounts without proxy share one pool) ===
+HTTP_POOL_CONFIG = {
+    'limit': 0,              # No global connection cap
+    'limit_per_host': 50,    # Max parallel connections to the exchange host
+    'keepalive_timeout': 60, # Keep idle connections alive between monitor ticks (sec)
 }
 
 # === WebSocket Settings ===
@@ -24,6 +43,15 @@ WEBSOCKET_CONFIG = {
     'cache_max_age': 2.0,           # Max data age in cache (sec)
     'fallback_to_rest': True,       # Fallback to REST API if WebSocket unavailable
     'check_interval': 3,            # Check status every 3 sec
+    'positions_stream_enabled': True,       # Track positions via private account stream
+    'positions_reconcile_interval': 60.0,   # REST reconciliation of cached positions (sec)
+    'positions_wait_reconcile': 10.0,       # Order/close waiters re-check via REST at least this often (sec)
+}
+
+# === Position Monitor Log Settings ===
+MONITOR_LOG_CONFIG = {
+    'summary_pnl_change': 0.5,   # Print batch summary when any PnL% moved by at least this much
+    'summary_every_ticks': 5,    # ...or at least every N monitor ticks
 }
 
 # === Onboarding Settings (automatic) ===
@@ -43,6 +71,12 @@ LIMIT_ORDER_CONFIG = {
     'websocket_fallback_to_rest': WEBSOCKET_CONFIG['fallback_to_rest'],
     'check_interval': WEBSOCKET_CONFIG['check_interval'],
     'use_market_fallback': True,  # Close with market order if limit orders fail
+    'rest_price_memo_ttl': 0.5,  # Share one REST price fetch between concurrent orders (seconds)
+    'cancel_confirm_timeout': 1.0,   # Max wait for cancelled orders to leave the open list (seconds)
+    'cancel_confirm_interval': 0.25,  # Open orders poll interval while waiting (seconds)
+    'round_positions_ttl': 1.5,  # Reuse one all-markets positions fetch per account within a close round (seconds)
+    'close_cancel_mode': 'mass',  # 'mass' - one massCancel per account for all its markets, 'per_market' - cancel per market
+    'close_fetch_timeout': 10.0,  # First close_all round: don't wait longer for slow accounts (next round rescans them)
 }
 
 # === Orchestrator (backward compatibility) ===
@@ -31,12 +31,14 @@ except ImportError:
 
 from modules.core.logger import setup_logger
 from modules.helpers.market_rules import market_rules
+from modules.core.json_utils import json_loads
 from modules.helpers.sdk_proxy_patch import (
     install_sdk_proxy_patch,
     install_sdk_market_order_patch,
     normalize_proxy_url,
     mask_proxy_url
 )
+from modules.core.constants import HTTP_POOL_CONFIG
 from settings import TRADING_SETTINGS
 
 # Устанавливаем патчи SDK при импорте модуля
@@ -179,11 +181,33 @@ class ExtendedClient:
     # УДАЛЕНО: _set_proxy и _clear_proxy больше не нужны
     # Каждый клиент теперь использует свою собственную сессию с прокси
 
-    async def initialize(self):
-        """Асинхронная инициализация клиента"""
+    async def initialize(self, shared_connector: Optional[aiohttp.BaseConnector] = None):
+        """
+        Асинхронная инициализация клиента
+
+        Args:
+            shared_connector: Общий пул соединений для аккаунтов без прокси
+                (владелец - вызывающий код, клиент его не закрывает)
+        """
         if self._initialized:
             return
 
+        def direct_session() -> aiohttp.ClientSession:
+            # Сессия без прокси: через общий пул, если он передан
+            if shared_connector is not None:
+                return aiohttp.ClientSession(
+                    connector=shared_connector,
+                    connector_owner=False,
+                    timeout=CLIENT_TIMEOUT
+                )
+            # Собственный пул с тем же keep-alive, что и у прокси-соединений
+            connector = aiohttp.TCPConnector(
+                limit=HTTP_POOL_CONFIG['limit'],
+                limit_per_host=HTTP_POOL_CONFIG['limit_per_host'],
+                keepalive_timeout=HTTP_POOL_CONFIG['keepalive_timeout']
+            )
+            return aiohttp.ClientSession(connector=connector, timeout=CLIENT_TIMEOUT)
+
         try:
             # Создаем trading client СНАЧАЛА
             self.trading_client = PerpetualTradingClient(
@@ -194,7 +218,13 @@ class ExtendedClient:
             # Создаем per-client aiohttp сессию с прокси
             if self.proxy and PROXY_SUPPORT:
                 try:
-                    connector = ProxyConnector.from_url(self.proxy)
+                    # Соединения через прокси держим открытыми между запросами
+                    # (по умолчанию aiohttp закрывает их через 15s простоя)
+                    connector = ProxyConnector.from_url(
+                        self.proxy,
+                        limit_per_host=HTTP_POOL_CONFIG['limit_per_host'],
+                        keepalive_timeout=HTTP_POOL_CONFIG['keepalive_timeout']
+                    )
                     self._custom_session = aiohttp.ClientSession(
                         connector=connector,
                         timeout=CLIENT_TIMEOUT,
@@ -209,10 +239,10 @@ class ExtendedClient:
                         f"{self.account_config.name} | Ошибка создания сессии с прокси: {e}"
                     )
                     # Fallback на сессию без прокси
-                    self._custom_session = aiohttp.ClientSession(timeout=CLIENT_TIMEOUT)
+                    self._custom_session = direct_session()
             else:
                 # Без прокси или без поддержки прокси
-                self._custom_session = aiohttp.ClientSession(timeout=CLIENT_TIMEOUT)
+                self._custom_session = direct_session()
                 if not self.proxy:
                     self.logger.debug(f"{self.account_config.name} | Сессия создана БЕЗ прокси")
                 elif not PROXY_SUPPORT:
@@ -317,7 +347,7 @@ class ExtendedClient:
             try:
                 async with session.get(url) as resp:
                     if resp.status == 200:
-                        data = await resp.json()
+                        data = await resp.json(loads=json_loads)
                         market_list = data.get('data', [])
                         if market_list:
                             # SDK ожидает MarketModel, создаем из dict
@@ -613,6 +643,7 @@ class ExtendedClient:
         time_in_force: str = "GTT",
         stop_loss: Optional[OrderTpslTriggerParam] = None,
         tp_sl_type: Optional[OrderTpslType] = None,
+        previous_order_id: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Разместить лимитный ордер
@@ -625,9 +656,11 @@ class ExtendedClient:
             post_only: Только maker (не исполнять немедленно)
             reduce_only: Только закрытие позиции
             time_in_force: Тип срока действия ("GTT", "IOC")
+            previous_order_id: external_id ордера, который биржа отменит атомарно
+                при размещении этого (cancel-replace, без отдельного запроса отмены)
 
         Returns:
-            Информация о размещенном ордере
+            Информация о размещенном ордере (включая 'id' и 'external_id')
         """
         await self._ensure_initialized()
 
@@ -658,10 +691,12 @@ class ExtendedClient:
                 time_in_force=tif,
                 stop_loss=stop_loss,
                 tp_sl_type=tp_sl_type,
+                previous_order_id=previous_order_id,
             )
 
             # Получаем order_id напрямую из response.data.id (как в extended_v0.55)
             order_id = placed_order.data.id if hasattr(placed_order, 'data') and hasattr(placed_order.data, 'id') else 'unknown'
+            external_id = getattr(getattr(placed_order, 'data', None), 'external_id', None)
             
             # Конвертируем в словарь для возврата
             order_dict = placed_order.model_dump() if hasattr(placed_order, 'model_dump') else placed_order
@@ -669,6 +704,7 @@ class ExtendedClient:
             # Добавляем order_id в словарь для удобства
             if isinstance(order_dict, dict):
                 order_dict['id'] = order_id
+                order_dict['external_id'] = external_id
 
             self.logger.info(
                 f"{self.account_config.name} | Лимит-ордер размещен: ID={order_id}"
@@ -684,6 +720,25 @@ class ExtendedClient:
             self.logger.debug(f"Traceback: {traceback.format_exc()}")
             raise
 
+    async def place_limit_orders_batch(self, orders: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Разместить несколько лимитных ордеров аккаунта за один вызов
+
+        У Extended нет bulk-эндпоинта размещения, поэтому ордера отправляются
+        одновременно через сессию аккаунта, а не по одному.
+
+        Args:
+            orders: Список параметров place_limit_order (market, side, amount, price, ...)
+
+        Returns:
+            Результаты в порядке orders: словарь ордера или исключение при ошибке
+        """
+        await self._ensure_initialized()
+        return list(await asyncio.gather(
+            *(self.place_limit_order(**order) for order in orders),
+            return_exceptions=True
+        ))
+
     async def place_stop_loss(
         self,
         market: str,
@@ -800,14 +855,23 @@ class ExtendedClient:
             + (f" для {market}" if market else "")
         )
 
+        order_ids = [
+            order_id for order_id in (
+                o.get('id') or o.get('orderId') or o.get('order_id') for o in open_orders
+            ) if order_id
+        ]
+
+        # Несколько ордеров отменяем одним запросом massCancel по их ID
+        if len(order_ids) > 1 and market_data_provider is not None:
+            if await self._post_mass_cancel({'orderIds': order_ids}, market_data_provider):
+                return len(order_ids)
+
         cancelled_count = 0
-        for order in open_orders:
-            order_id = order.get('id') or order.get('orderId') or order.get('order_id')
-            if order_id:
-                if await self.cancel_order(order_id):
-                    cancelled_count += 1
-                # Небольшая задержка между отменами
-                await asyncio.sleep(0.2)
+        for order_id in order_ids:
+            if await self.cancel_order(order_id):
+                cancelled_count += 1
+            # Небольшая задержка между отменами
+            await asyncio.sleep(0.2)
 
         return cancelled_count
 
@@ -875,14 +939,44 @@ class ExtendedClient:
         Returns:
             True если запрос прошел успешно, False при ошибке
         """
-        try:
-            if market_data_provider is None:
-                self.logger.warning(
-                    f"{self.account_config.name} | mass_cancel_all_orders: "
-                    "market_data_provider не передан, невозможно выполнить запрос"
-                )
-                return False
+        if market_data_provider is None:
+            self.logger.warning(
+                f"{self.account_config.name} | mass_cancel_all_orders: "
+                "market_data_provider не передан, невозможно выполнить запрос"
+            )
+            return False
+
+        # Отменяем ВСЕ ордера аккаунта
+        return await self._post_mass_cancel({'cancelAll': True}, market_data_provider)
+
+    async def mass_cancel_markets(self, markets: List[str], market_data_provider=None) -> bool:
+        """
+        Массовая отмена ордеров аккаунта по нескольким рынкам одним запросом
+
+        Args:
+            markets: Рынки (например ["BTC-USD", "ETH-USD"])
+            market_data_provider: MarketDataProvider для HTTP запросов
+
+        Returns:
+            True если запрос прошел успешно, False при ошибке
+        """
+        if market_data_provider is None or not markets:
+            return False
 
+        return await self._post_mass_cancel({'markets': list(markets)}, market_data_provider)
+
+    async def _post_mass_cancel(self, payload: Dict[str, Any], market_data_provider) -> bool:
+        """
+        Выполнить POST /user/order/massCancel
+
+        Args:
+            payload: Тело запроса ({'cancelAll': True}, {'orderIds': [...]} или {'markets': [...]})
+            market_data_provider: MarketDataProvider для HTTP запросов
+
+        Returns:
+            True если запрос прошел успешно, False при ошибке
+        """
+        try:
             # Получаем сессию из market_data_provider
             session = await market_data_provider._get_session()
             base_url = market_data_provider.base_url
@@ -894,13 +988,8 @@ class ExtendedClient:
                 'User-Agent': 'Extended-Bot/0.1'
             }
 
-            # Отменяем ВСЕ ордера аккаунта
-            payload = {
-                'cancelAll': True
-            }
-
             async with session.post(url, json=payload, headers=headers) as response:
-                data = await response.json()
+                data = await response.json(loads=json_loads)
 
                 if response.status == 200 and data.get('status') == 'OK':
                     self.logger.debug(f"{self.account_config.name} | mass cancel OK")
@@ -912,7 +1001,7 @@ class ExtendedClient:
 
         except Exception as e:
             self.logger.error(
-                f"{self.account_config.name} | Ошибка mass_cancel_all_orders: {e}"
+                f"{self.account_config.name} | Ошибка mass cancel: {e}"
             )
             return False
 
@@ -0,0 +1,20 @@
+"""
+JSON Utils - быстрая (de)сериализация JSON для REST и WebSocket
+Использует orjson, если он установлен, иначе стандартный json
+"""
+
+import json
+
+try:
+    import orjson
+    json_loads = orjson.loads
+
+    def json_dumps(obj) -> str:
+        """Сериализация тела запроса (aiohttp ожидает str, Decimal уходит строкой)"""
+        return orjson.dumps(obj, default=str).decode()
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj) -> str:
+        """Сериализация тела запроса (Decimal уходит строкой)"""
+        return json.dumps(obj, default=str)
@@ -50,11 +50,22 @@ class Logger:
         self.telegram_api = telegram_api
         self.telegram_chat_id = telegram_chat_id
 
+        # Уровень лог-файла задается в settings.py (LOG_SETTINGS['level']); консоль не
+        # подробнее INFO. От этого уровня зависит isEnabledFor - при INFO отладочные
+        # сообщения вообще не формируются
+        try:
+            from settings import LOG_SETTINGS
+        except ImportError:
+            LOG_SETTINGS = {}
+        file_level = str(LOG_SETTINGS.get('level', 'INFO')).upper()
+        console_level = file_level if file_level in ("WARNING", "ERROR") else "INFO"
+        file_max_mb = LOG_SETTINGS.get('file_max_mb', 100)
+
         # Консольный вывод с красивым форматированием
         self._logger.add(
             sys.stderr,
             format="<green>{time:MM-DD HH:mm:ss}</green> | <level>{message}</level>",
-            level="INFO",
+            level=console_level,
             colorize=True  # ВАЖНО: явно включаем цвета
         )
 
@@ -64,12 +75,18 @@ class Logger:
 
         self._logger.add(
             log_file,
-            rotation="100 MB",
+            rotation=f"{file_max_mb} MB",
             retention="30 days",
-            level="DEBUG",
+            level=file_level,
             format="{time:DD-MM HH:mm:ss} | {level: <8} | {message}"
         )
 
+        # Минимальный уровень среди всех обработчиков (номера совпадают с logging)
+        self._min_level_no = min(
+            self._logger.level(console_level).no,
+            self._logger.level(file_level).no
+        )
+
         # Telegram настройки - если не заполнены, просто не отправляем уведомления
         # (без вывода сообщения в лог)
 
@@ -154,6 +171,20 @@ class Logger:
         """Отладочное сообщение"""
         self._log('debug', message, telegram, exc_info)
 
+    def isEnabledFor(self, level) -> bool:
+        """
+        Проверить, попадет ли сообщение данного уровня хотя бы в один обработчик
+
+        Args:
+            level: Уровень как в logging (logging.DEBUG) или имя уровня loguru ('DEBUG')
+
+        Returns:
+            True если сообщения этого уровня будут записаны
+        """
+        if isinstance(level, str):
+            level = self._logger.level(level.upper()).no
+        return level >= self._min_level_no
+
     def __getattr__(self, name: str) -> callable:
         """Проксируем все остальные методы loguru"""
         return getattr(self._logger, name)
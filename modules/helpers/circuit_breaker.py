@@ -0,0 +1,70 @@
+"""
+Circuit Breaker - временное отключение опроса аккаунта после серии ошибок
+Не дает мониторингу долбить биржу запросами, которые все равно падают
+"""
+
+import time
+from typing import Optional
+
+
+class CircuitBreaker:
+    """
+    Простой circuit breaker (closed → open → half-open)
+
+    - closed: запросы разрешены, ошибки подряд считаются
+    - open: после fail_max ошибок подряд запросы пропускаются reset_timeout секунд
+    - half-open: по истечении reset_timeout разрешается одна пробная попытка;
+      успех закрывает breaker, ошибка снова открывает его
+
+    Методы record_* возвращают True при смене состояния, чтобы вызывающий код
+    логировал только переходы, а не каждую ошибку.
+    """
+
+    def __init__(self, fail_max: int = 3, reset_timeout: float = 30.0):
+        """
+        Инициализация
+
+        Args:
+            fail_max: Количество ошибок подряд до размыкания
+            reset_timeout: Время в разомкнутом состоянии (сек)
+        """
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+
+    @property
+    def is_open(self) -> bool:
+        """True если запросы сейчас нужно пропускать"""
+        if self._opened_at is None:
+            return False
+        return time.monotonic() - self._opened_at < self.reset_timeout
+
+    def record_success(self) -> bool:
+        """
+        Отметить успешный запрос
+
+        Returns:
+            True если breaker был разомкнут и теперь замкнулся
+        """
+        was_open = self._opened_at is not None
+        self._failures = 0
+        self._opened_at = None
+        return was_open
+
+    def record_failure(self) -> bool:
+        """
+        Отметить неудачный запрос
+
+        Returns:
+            True если breaker только что разомкнулся
+        """
+        self._failures += 1
+        if self._opened_at is not None:
+            # Пробная попытка в half-open не удалась - снова ждем reset_timeout
+            self._opened_at = time.monotonic()
+            return False
+        if self._failures >= self.fail_max:
+            self._opened_at = time.monotonic()
+            return True
+        return False
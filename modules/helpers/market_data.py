@@ -3,6 +3,7 @@ Market Data - Получение рыночных данных из Extended API
 Поддерживает подключение через прокси (HTTP/SOCKS5)
 """
 
+import asyncio
 import aiohttp
 import traceback
 from decimal import Decimal
@@ -16,6 +17,8 @@ except ImportError:
     PROXY_SUPPORT = False
 
 from modules.core.logger import setup_logger
+from modules.core.constants import HTTP_POOL_CONFIG
+from modules.core.json_utils import json_dumps, json_loads
 
 
 @dataclass
@@ -95,6 +98,8 @@ class MarketDataProvider:
         self.proxy = proxy
         self.logger = logger or setup_logger()
         self.session: Optional[aiohttp.ClientSession] = None
+        # Общий пул соединений (задается владельцем, например BatchTrader); используется без прокси
+        self.shared_connector: Optional[aiohttp.BaseConnector] = None
 
     async def _get_session(self) -> aiohttp.ClientSession:
         """Получить или создать aiohttp сессию (с прокси если задан)"""
@@ -115,14 +120,39 @@ class MarketDataProvider:
                     # Для HTTP прокси параметр rdns не поддерживается
                     use_rdns = normalized_proxy.lower().startswith('socks')
 
-                    connector = ProxyConnector.from_url(normalized_proxy, rdns=use_rdns)
+                    connector = ProxyConnector.from_url(
+                        normalized_proxy,
+                        rdns=use_rdns,
+                        limit_per_host=HTTP_POOL_CONFIG['limit_per_host'],
+                        keepalive_timeout=HTTP_POOL_CONFIG['keepalive_timeout']
+                    )
                     self.logger.debug(f"🌐 MarketData: использую прокси {self._mask_proxy(normalized_proxy)}")
                 except Exception as e:
                     self.logger.error(f"❌ Ошибка создания прокси коннектора: {e}")
                     raise
+            elif self.shared_connector is not None and not self.shared_connector.closed:
+                # Без прокси: общий пул с клиентами аккаунтов (закрывает его владелец)
+                self.session = aiohttp.ClientSession(
+                    connector=self.shared_connector,
+                    connector_owner=False,
+                    trust_env=False,
+                    json_serialize=json_dumps
+                )
+                return self.session
+            else:
+                # Без прокси: пул на параллельные запросы по аккаунтам, DNS кешируется надолго
+                connector = aiohttp.TCPConnector(
+                    limit_per_host=HTTP_POOL_CONFIG['limit_per_host'],
+                    keepalive_timeout=HTTP_POOL_CONFIG['keepalive_timeout'],
+                    ttl_dns_cache=300
+                )
 
             # trust_env=False - игнорировать системные прокси (VPN), использовать только заданный прокси
-            self.session = aiohttp.ClientSession(connector=connector, trust_env=False)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                trust_env=False,
+                json_serialize=json_dumps
+            )
         return self.session
 
     def _normalize_proxy_url(self, proxy_url: str) -> str:
@@ -231,7 +261,7 @@ class MarketDataProvider:
                 headers=default_headers
             ) as response:
                 response.raise_for_status()
-                data = await response.json()
+                data = await response.json(loads=json_loads)
 
                 # Проверка статуса в ответе Extended API
                 if data.get('status') == 'error':
@@ -493,6 +523,35 @@ class MarketDataProvider:
             self.logger.error(f"Ошибка получения позиций через REST API: {e}")
             raise
 
+    async def get_positions_rest_bulk(
+        self,
+        api_keys: List[str],
+        market: Optional[str] = None
+    ) -> Dict[str, List[Dict]]:
+        """
+        Получить позиции нескольких аккаунтов параллельно через одну сессию
+
+        Запросы идут одновременно через общий пул соединений провайдера,
+        поэтому TLS и DNS переиспользуются между аккаунтами.
+
+        Args:
+            api_keys: API ключи аккаунтов
+            market: Фильтр по рынку (опционально)
+
+        Returns:
+            Словарь api_key -> список позиций (аккаунты с ошибкой запроса отсутствуют)
+        """
+        results = await asyncio.gather(
+            *(self.get_positions_rest(api_key=api_key, market=market) for api_key in api_keys),
+            return_exceptions=True
+        )
+
+        return {
+            api_key: result
+            for api_key, result in zip(api_keys, results)
+            if not isinstance(result, BaseException)
+        }
+
     async def get_order_status_rest(
         self,
         api_key: str,
@@ -581,10 +640,12 @@ class MarketDataProvider:
         """Закрыть HTTP сессию"""
         if self.session and not self.session.closed:
             try:
+                owns_connector = self.session.connector_owner
                 await self.session.close()
                 # Небольшая задержка для корректного закрытия всех соединений
-                import asyncio
-                await asyncio.sleep(0.25)
+                # (общий пул закрывает его владелец - ждать нечего)
+                if owns_connector:
+                    await asyncio.sleep(0.25)
                 self.logger.debug("HTTP сессия закрыта")
             except Exception as e:
                 self.logger.debug(f"Ошибка закрытия HTTP сессии: {e}")
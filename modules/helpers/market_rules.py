@@ -3,7 +3,7 @@ Market Rules Helper - Получение правил трейдинга для
 """
 
 from decimal import Decimal, ROUND_DOWN
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from modules.core.market_rules_config import MARKET_RULES
 
 
@@ -12,6 +12,48 @@ class MarketRulesHelper:
 
     def __init__(self):
         self.rules = MARKET_RULES
+        # (поле правил, монета) -> (шаг, quantum); правила статичны, разбираем один раз
+        self._steps: Dict[Tuple[str, str], Tuple[Optional[Decimal], Optional[Decimal]]] = {}
+
+    def _get_step(self, field: str, market: str) -> Tuple[Optional[Decimal], Optional[Decimal]]:
+        """
+        Шаг округления из правил монеты (кешируется)
+
+        Args:
+            field: Поле правил ('min_change_size', 'min_price_change' или 'min_trade_size')
+            market: Тикер монеты
+
+        Returns:
+            (step, quantum): quantum - шаг для Decimal.quantize, если шаг вида 1, 0.1, 0.01...;
+            иначе None. (None, None) если монета не найдена
+        """
+        key = (field, market)
+        cached = self._steps.get(key)
+        if cached is None:
+            rules = self.get_market_rules(market)
+            step = Decimal(str(rules[field])) if rules else None
+            quantum = None
+            if step is not None:
+                step_tuple = step.as_tuple()
+                if step_tuple.digits == (1,) and step_tuple.exponent <= 0:
+                    quantum = step
+            cached = self._steps[key] = (step, quantum)
+        return cached
+
+    def _round_down_to_step(self, field: str, market: str, value: Decimal) -> Decimal:
+        """Округлить значение вниз до шага из правил монеты"""
+        step, quantum = self._get_step(field, market)
+        if step is None:
+            return value
+
+        if not isinstance(value, Decimal):
+            value = Decimal(str(value))
+
+        # Дробный шаг - одним quantize, остальные (10, 100, 0.5...) - через деление
+        if quantum is not None:
+            return value.quantize(quantum, rounding=ROUND_DOWN)
+        multiplier = (value / step).quantize(Decimal('1'), rounding=ROUND_DOWN)
+        return multiplier * step
 
     def get_market_rules(self, market: str) -> Optional[Dict]:
         """
@@ -28,11 +70,8 @@ class MarketRulesHelper:
         return self.rules.get(clean_market)
 
     def get_min_trade_size(self, market: str) -> Optional[Decimal]:
-        """Получить минимальный размер позиции для монеты"""
-        rules = self.get_market_rules(market)
-        if rules:
-            return Decimal(rules['min_trade_size'])
-        return None
+        """Получить минимальный размер позиции для монеты (кешируется)"""
+        return self._get_step('min_trade_size', market)[0]
 
     def get_min_change_size(self, market: str) -> Optional[Decimal]:
         """Получить минимальное изменение размера позиции"""
@@ -184,17 +223,7 @@ class MarketRulesHelper:
         Returns:
             Округленный размер
         """
-        min_change = self.get_min_change_size(market)
-        if min_change is None:
-            return size
-
-        # Конвертируем в Decimal если еще не Decimal
-        size = Decimal(str(size))
-        min_change = Decimal(str(min_change))
-
-        # Округляем вниз до ближайшего min_change
-        multiplier = (size / min_change).quantize(Decimal('1'), rounding=ROUND_DOWN)
-        return multiplier * min_change
+        return self._round_down_to_step('min_change_size', market, size)
 
     def round_price_to_min_change(self, market: str, price: Decimal) -> Decimal:
         """
@@ -207,18 +236,7 @@ class MarketRulesHelper:
         Returns:
             Округленная цена
         """
-        min_change = self.get_min_price_change(market)
-        if min_change is None:
-            return price
-
-        # Конвертируем в Decimal если еще не Decimal
-        price = Decimal(str(price))
-        min_change = Decimal(str(min_change))
-
-        # Округляем до ближайшего min_change (вниз)
-        # Используем quantize для правильного округления
-        multiplier = (price / min_change).quantize(Decimal('1'), rounding=ROUND_DOWN)
-        return multiplier * min_change
+        return self._round_down_to_step('min_price_change', market, price)
 
     def get_market_info_str(self, market: str) -> str:
         """
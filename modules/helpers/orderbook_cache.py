@@ -107,6 +107,46 @@ class OrderBookCache:
 
         return (cache_entry['bid'], cache_entry['ask'])
 
+    def get_top(self, market: str, max_age_seconds: float = 2.0) -> Optional[Tuple[Decimal, Decimal]]:
+        """
+        Быстрое чтение лучших bid/ask для горячего пути (без логирования промахов)
+
+        Args:
+            market: Название рынка (BTC-USD или просто BTC)
+            max_age_seconds: Максимальный возраст данных в секундах
+
+        Returns:
+            Tuple[bid, ask] если данные свежие, иначе None
+        """
+        if '-' not in market:
+            market = f"{market}-USD"
+
+        cache_entry = self._cache.get(market.upper())
+        if cache_entry is None or time.time() - cache_entry['timestamp'] > max_age_seconds:
+            return None
+
+        return cache_entry['bid'], cache_entry['ask']
+
+    def get_mid(self, market: str, max_age_seconds: float = 2.0) -> Optional[Decimal]:
+        """
+        Быстрое чтение mid цены для горячего пути (без логирования промахов)
+
+        Args:
+            market: Название рынка (BTC-USD или просто BTC)
+            max_age_seconds: Максимальный возраст данных в секундах
+
+        Returns:
+            (bid + ask) / 2 если данные свежие, иначе None
+        """
+        if '-' not in market:
+            market = f"{market}-USD"
+
+        cache_entry = self._cache.get(market.upper())
+        if cache_entry is None or time.time() - cache_entry['timestamp'] > max_age_seconds:
+            return None
+
+        return cache_entry['mid_price']
+
     def get_spread_percent(self, market: str) -> Optional[Decimal]:
         """
         Возвращает процент спреда для рынка
@@ -0,0 +1,248 @@
+"""
+Position Cache - кеширование открытых позиций аккаунтов из приватного WebSocket
+Позволяет мониторингу читать позиции без REST запроса на каждой итерации
+"""
+
+import asyncio
+import time
+from typing import Optional, Dict, List, Tuple
+
+from modules.core.logger import setup_logger
+
+logger = setup_logger()
+
+
+def _is_closed_position(position: Dict) -> bool:
+    """Позиция из потока считается закрытой при статусе CLOSED или нулевом размере"""
+    if str(position.get('status', '')).upper() == 'CLOSED':
+        return True
+    try:
+        return float(position.get('size', 0) or 0) == 0.0
+    except (ValueError, TypeError):
+        return False
+
+
+class PositionCache:
+    """
+    Глобальный кеш позиций по аккаунтам
+
+    Использует синглтон паттерн (как OrderBookCache).
+    Наполняется из двух источников:
+    - REST снапшот (холодный старт и периодическая сверка)
+    - Приватный WebSocket поток аккаунта (обновления в реальном времени)
+
+    Данным кеша можно доверять только пока поток аккаунта подключен
+    и снапшот по рынку не старше интервала сверки.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        """Создаем единственный экземпляр класса (синглтон)"""
+        if cls._instance is None:
+            cls._instance = super(PositionCache, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        """Инициализация кеша"""
+        if self._initialized:
+            return
+
+        # account_name -> market -> позиция
+        self._positions: Dict[str, Dict[str, Dict]] = {}
+        # (account_name, market) -> время последнего REST снапшота
+        self._synced_at: Dict[Tuple[str, str], float] = {}
+        # account_name -> подключен ли приватный поток
+        self._stream_connected: Dict[str, bool] = {}
+        # account_name -> событие "позиции аккаунта изменились" (пересоздается после срабатывания)
+        self._update_events: Dict[str, asyncio.Event] = {}
+        # Счетчик изменений из потока и номер последнего изменения по рынку / по всему аккаунту
+        # (снапшот потока и смена состояния потока затрагивают все рынки аккаунта)
+        self._seq = 0
+        self._market_seq: Dict[Tuple[str, str], int] = {}
+        self._account_seq: Dict[str, int] = {}
+        self._initialized = True
+
+    def marker(self) -> int:
+        """
+        Метка "до запроса" для set_snapshot
+
+        Снимается перед REST запросом позиций: если поток успел что-то применить
+        после метки, ответ REST старее кеша и не должен его перезаписывать.
+
+        Returns:
+            Номер последнего изменения из потока
+        """
+        return self._seq
+
+    def _bump_account(self, account_name: str):
+        """Отметить изменение, затрагивающее все рынки аккаунта"""
+        self._seq += 1
+        self._account_seq[account_name] = self._seq
+
+    def _notify(self, account_name: str):
+        """Разбудить всех, кто ждет обновления позиций аккаунта"""
+        event = self._update_events.pop(account_name, None)
+        if event is not None:
+            event.set()
+
+    async def wait_for_update(self, account_name: str, timeout: float) -> bool:
+        """
+        Дождаться обновления позиций аккаунта из потока (или смены состояния потока)
+
+        Args:
+            account_name: Имя аккаунта
+            timeout: Максимальное время ожидания (сек)
+
+        Returns:
+            True если обновление пришло, False по таймауту
+        """
+        event = self._update_events.get(account_name)
+        if event is None:
+            event = self._update_events[account_name] = asyncio.Event()
+        try:
+            await asyncio.wait_for(event.wait(), timeout=max(timeout, 0))
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def is_stream_connected(self, account_name: str) -> bool:
+        """Подключен ли приватный поток аккаунта"""
+        return self._stream_connected.get(account_name, False)
+
+    def set_stream_state(self, account_name: str, connected: bool):
+        """
+        Отмечает состояние приватного потока аккаунта
+
+        При обрыве потока кеш аккаунта перестает считаться актуальным
+        до следующего REST снапшота после переподключения.
+
+        Args:
+            account_name: Имя аккаунта
+            connected: True если поток подключен
+        """
+        self._stream_connected[account_name] = connected
+        # Запросы, начатые до смены состояния потока, не должны считаться свежими
+        self._bump_account(account_name)
+        if not connected:
+            # Обновления могли потеряться - требуем новый снапшот
+            for key in [k for k in self._synced_at if k[0] == account_name]:
+                del self._synced_at[key]
+            # Ожидающие должны перейти на REST
+            self._notify(account_name)
+
+    def set_snapshot(self, account_name: str, market: str, positions: List[Dict], since: int) -> bool:
+        """
+        Сохраняет REST снапшот позиций аккаунта по рынку
+
+        Если после метки since поток уже применил изменение по этому рынку (или по
+        всему аккаунту), снапшот старее кеша - он отбрасывается, а время сверки не
+        обновляется: следующее чтение снова пойдет в REST.
+
+        Args:
+            account_name: Имя аккаунта
+            market: Название рынка (BTC-USD)
+            positions: Список позиций, полученный через REST/SDK
+            since: Метка marker(), снятая перед запросом
+
+        Returns:
+            True если снапшот записан, False если отброшен как устаревший
+        """
+        market = market.upper()
+        changed_at = max(
+            self._market_seq.get((account_name, market), 0),
+            self._account_seq.get(account_name, 0)
+        )
+        if changed_at > since:
+            logger.debug(f"👤 {account_name}: снапшот {market} устарел (поток обновился во время запроса)")
+            return False
+
+        account_positions = self._positions.setdefault(account_name, {})
+        account_positions.pop(market, None)
+
+        for position in positions or []:
+            if str(position.get('market', '')).upper() == market and not _is_closed_position(position):
+                account_positions[market] = position
+                break
+
+        self._synced_at[(account_name, market)] = time.monotonic()
+        return True
+
+    def apply_update(self, account_name: str, positions: List[Dict], is_snapshot: bool = False):
+        """
+        Применяет обновление позиций из приватного WebSocket
+
+        Args:
+            account_name: Имя аккаунта
+            positions: Список обновленных позиций
+            is_snapshot: True если сервер прислал полный снапшот позиций
+        """
+        account_positions = self._positions.setdefault(account_name, {})
+        if is_snapshot:
+            account_positions.clear()
+            self._bump_account(account_name)
+
+        for position in positions:
+            market = str(position.get('market', '')).upper()
+            if not market:
+                continue
+            self._seq += 1
+            self._market_seq[(account_name, market)] = self._seq
+            if _is_closed_position(position):
+                account_positions.pop(market, None)
+            else:
+                account_positions[market] = position
+
+        self._notify(account_name)
+
+    def get_positions(
+        self,
+        account_name: str,
+        market: str,
+        max_sync_age: float
+    ) -> Optional[List[Dict]]:
+        """
+        Получить позиции аккаунта по рынку из кеша
+
+        Args:
+            account_name: Имя аккаунта
+            market: Название рынка (BTC-USD)
+            max_sync_age: Максимальный возраст REST снапшота (сек), после которого нужна сверка
+
+        Returns:
+            Список позиций (пустой если позиция закрыта) или None если кешу нельзя доверять
+        """
+        if not self._stream_connected.get(account_name):
+            return None
+
+        market = market.upper()
+        synced_at = self._synced_at.get((account_name, market))
+        if synced_at is None or time.monotonic() - synced_at > max_sync_age:
+            return None
+
+        position = self._positions.get(account_name, {}).get(market)
+        return [position] if position is not None else []
+
+    def clear(self, account_name: Optional[str] = None):
+        """
+        Очищает кеш
+
+        Args:
+            account_name: Имя аккаунта (если None - очищается весь кеш)
+        """
+        if account_name:
+            self._positions.pop(account_name, None)
+            self._stream_connected.pop(account_name, None)
+            for key in [k for k in self._synced_at if k[0] == account_name]:
+                del self._synced_at[key]
+            logger.debug(f"👤 {account_name}: кеш позиций очищен")
+        else:
+            self._positions.clear()
+            self._synced_at.clear()
+            self._stream_connected.clear()
+            logger.debug("👤 Весь кеш позиций очищен")
+
+
+# Глобальный экземпляр кеша
+position_cache = PositionCache()
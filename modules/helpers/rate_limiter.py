@@ -0,0 +1,62 @@
+"""
+Rate Limiter - ограничение частоты запросов к бирже (token bucket)
+Сглаживает всплески параллельных запросов пачки, чтобы не упираться в лимиты API
+"""
+
+import asyncio
+import time
+
+
+class AsyncRateLimiter:
+    """
+    Асинхронный token bucket
+
+    Разрешает не более max_rate запросов за time_period секунд.
+    Пока токены есть - запрос проходит сразу (всплеск до max_rate),
+    дальше корутины ждут пополнения в порядке очереди.
+
+    Использование:
+        limiter = AsyncRateLimiter(max_rate=8, time_period=1.0)
+        async with limiter:
+            await client.update_leverage(...)
+    """
+
+    def __init__(self, max_rate: float, time_period: float = 1.0):
+        """
+        Инициализация лимитера
+
+        Args:
+            max_rate: Количество запросов за период (размер корзины)
+            time_period: Период в секундах
+        """
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._rate_per_sec = max_rate / time_period
+        self._tokens = float(max_rate)
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        """Пополнить корзину пропорционально прошедшему времени"""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(float(self.max_rate), self._tokens + elapsed * self._rate_per_sec)
+            self._last_refill = now
+
+    async def acquire(self):
+        """Дождаться токена и забрать его"""
+        # Лок сохраняет порядок очереди: следующий ждет, пока предыдущий получит токен
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self._rate_per_sec)
+                self._refill()
+            self._tokens -= 1
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
@@ -1,13 +1,14 @@
 """
 WebSocket Manager - управление WebSocket подключениями к Extended API
 Подписывается на orderbook каналы и обновляет кеш в реальном времени
+Опционально слушает приватные потоки аккаунтов и обновляет кеш позиций
 Поддерживает подключение через прокси (HTTP/SOCKS5)
 """
 
 import asyncio
 import json
 import websockets
-from typing import List, Optional
+from typing import Dict, List, Optional
 from decimal import Decimal
 from urllib.parse import urlparse
 
@@ -18,8 +19,10 @@ try:
 except ImportError:
     PROXY_SUPPORT = False
 
+from modules.core.json_utils import json_loads
 from modules.core.logger import setup_logger
 from modules.helpers.orderbook_cache import orderbook_cache
+from modules.helpers.position_cache import position_cache
 
 logger = setup_logger()
 
@@ -50,6 +53,8 @@ class ExtendedWebSocketManager:
         self.running = False
         self.reconnect_delay = 2  # Быстрое переподключение (2 секунды)
         self.reconnect_count = {}  # Счетчик переподключений для каждого рынка
+        # Приватные потоки аккаунтов: имя аккаунта -> {'api_key', 'proxy'}
+        self.account_streams: Dict[str, Dict] = {}
 
         # WebSocket URL из документации Extended
         if testnet:
@@ -80,6 +85,11 @@ class ExtendedWebSocketManager:
             task = asyncio.create_task(self._run_websocket_for_market(market))
             tasks.append(task)
 
+        # И отдельную задачу для приватного потока каждого аккаунта
+        for account_name in self.account_streams:
+            task = asyncio.create_task(self._run_account_stream(account_name))
+            tasks.append(task)
+
         # Ждем завершения всех задач (они будут работать бесконечно с переподключениями)
         await asyncio.gather(*tasks, return_exceptions=True)
 
@@ -110,6 +120,17 @@ class ExtendedWebSocketManager:
         self.ws_connections.clear()
         logger.debug("WebSocket Manager остановлен")
 
+    def add_account_stream(self, account_name: str, api_key: str, proxy: Optional[str] = None):
+        """
+        Регистрирует приватный поток аккаунта (позиции) до вызова start()
+
+        Args:
+            account_name: Имя аккаунта
+            api_key: API ключ аккаунта (передается в заголовке X-Api-Key)
+            proxy: Прокси аккаунта (поток идет с того же IP, что и REST запросы)
+        """
+        self.account_streams[account_name] = {'api_key': api_key, 'proxy': proxy}
+
     def _get_next_proxy(self) -> Optional[str]:
         """
         Получить следующий прокси из списка (ротация по кругу)
@@ -364,6 +385,134 @@ class ExtendedWebSocketManager:
 
         logger.info(f"🛑 WebSocket для {market} остановлен")
 
+    async def _connect_account_stream(self, ws_url: str, api_key: str, proxy_url: Optional[str]):
+        """
+        Подключиться к приватному потоку аккаунта (через aiohttp, с прокси или напрямую)
+
+        Args:
+            ws_url: URL WebSocket сервера
+            api_key: API ключ аккаунта
+            proxy_url: URL прокси аккаунта или None
+
+        Returns:
+            WebSocket соединение (aiohttp ClientWebSocketResponse)
+        """
+        if not PROXY_SUPPORT:
+            logger.error("❌ aiohttp не установлен! Выполните: pip install aiohttp")
+            raise ImportError("aiohttp not installed")
+
+        timeout = aiohttp.ClientTimeout(total=30, connect=10)
+
+        proxy_url_clean = None
+        proxy_auth = None
+        if proxy_url:
+            parsed_proxy = urlparse(self._normalize_proxy_url(proxy_url))
+            proxy_url_clean = f"{parsed_proxy.scheme}://{parsed_proxy.hostname}:{parsed_proxy.port}"
+            if parsed_proxy.username and parsed_proxy.password:
+                proxy_auth = aiohttp.BasicAuth(
+                    login=parsed_proxy.username,
+                    password=parsed_proxy.password
+                )
+
+        session = aiohttp.ClientSession(timeout=timeout, trust_env=False)
+        try:
+            ws = await session.ws_connect(
+                ws_url,
+                headers={'X-Api-Key': api_key},
+                proxy=proxy_url_clean,
+                proxy_auth=proxy_auth,
+                heartbeat=15,
+                timeout=timeout.total,
+            )
+        except Exception:
+            await session.close()
+            raise
+
+        ws._aiohttp_session = session
+        return ws
+
+    async def _run_account_stream(self, account_name: str):
+        """
+        Запускает приватный поток аккаунта и обновляет кеш позиций
+        Автоматически переподключается при обрыве
+
+        Args:
+            account_name: Имя аккаунта
+        """
+        stream = self.account_streams[account_name]
+        ws_url = f"{self.ws_base_url}/stream.extended.exchange/v1/account"
+
+        if account_name not in self.reconnect_count:
+            self.reconnect_count[account_name] = 0
+
+        while self.running:
+            ws = None
+            try:
+                ws = await self._connect_account_stream(ws_url, stream['api_key'], stream['proxy'])
+                self.ws_connections[account_name] = ws
+                position_cache.set_stream_state(account_name, True)
+
+                async for msg in ws:
+                    if msg.type == aiohttp.WSMsgType.TEXT:
+                        self._handle_account_message(account_name, msg.data)
+                    elif msg.type == aiohttp.WSMsgType.ERROR:
+                        logger.error(f"❌ {account_name}: WebSocket error (поток аккаунта)")
+                        break
+
+            except asyncio.TimeoutError:
+                self.reconnect_count[account_name] += 1
+                logger.debug(f"⏱️ {account_name}: Timeout потока аккаунта, переподключение...")
+
+            except Exception as e:
+                self.reconnect_count[account_name] += 1
+                logger.debug(f"🔌 {account_name}: поток аккаунта прерван: {type(e).__name__}: {e}")
+
+            finally:
+                # Пока поток не подключен, кеш позиций аккаунта не используется
+                position_cache.set_stream_state(account_name, False)
+                if ws:
+                    try:
+                        if not ws.closed:
+                            await ws.close()
+                        await ws._aiohttp_session.close()
+                    except:
+                        pass
+
+            if self.running:
+                await asyncio.sleep(self.reconnect_delay)
+
+        logger.debug(f"🛑 Поток аккаунта {account_name} остановлен")
+
+    def _handle_account_message(self, account_name: str, message: str):
+        """
+        Обрабатывает сообщения приватного потока аккаунта
+
+        Args:
+            account_name: Имя аккаунта
+            message: JSON сообщение от сервера
+        """
+        try:
+            data = json_loads(message)
+
+            # Интересуют только обновления позиций:
+            # {"type": "POSITION", "data": {"positions": [{...}], "isSnapshot": false}, "seq": 1}
+            # Ордера, трейды и баланс игнорируются
+            if data.get('type') != 'POSITION':
+                return
+
+            msg_data = data.get('data') or {}
+            positions = msg_data.get('positions') or []
+            position_cache.apply_update(
+                account_name,
+                positions,
+                is_snapshot=bool(msg_data.get('isSnapshot', False))
+            )
+
+        except json.JSONDecodeError as e:
+            logger.error(f"❌ {account_name}: Ошибка парсинга JSON потока аккаунта: {e}")
+        except Exception as e:
+            logger.error(f"❌ {account_name}: Ошибка обработки сообщения потока аккаунта: {e}")
+
     async def _handle_message(self, market: str, message: str):
         """
         Обрабатывает входящие WebSocket сообщения
@@ -373,7 +522,7 @@ class ExtendedWebSocketManager:
             message: JSON сообщение от сервера
         """
         try:
-            data = json.loads(message)
+            data = json_loads(message)
 
             # Extended WebSocket возвращает сообщения в формате:
             # {
@@ -69,14 +69,14 @@ POSITION_MANAGEMENT = {
 
 # === Задержки ===
 DELAYS = {
-    'between_orders': [3, 5],    # Задержка между ордерами [min, max] (сек)
+    'between_orders': [3, 5],    # Задержка между ордерами [min, max] (сек), [0, 0] - все ордера пачки сразу
     'between_accounts': [3, 5],  # Задержка между аккаунтами [min, max] (сек)
     'on_error': 60,              # Задержка при ошибке (сек)
 }
 
 # === Логирование ===
 LOG_SETTINGS = {
-    'level': 'INFO',      # DEBUG, INFO, WARNING, ERROR
+    'level': 'INFO',      # DEBUG, INFO, WARNING, ERROR (DEBUG - подробный лог в database/logs.log)
     'file_max_mb': 100,   # Максимальный размер лог-файла (МБ)
     'stats_interval_sec': 300,  # Интервал вывода статистики оркестратора (сек)
 }